@@ -2,6 +2,11 @@ from subprocess import Popen, CREATE_NEW_CONSOLE, run
 import threading
 import sys
 
+from src.engine.bench import run_bench
+from src.utils.game_store import get_games_engine, import_pgn
+from src.utils.regressions import DEFAULT_ALPHA, DEFAULT_THRESHOLD as REGRESSION_THRESHOLD, run_regression_report
+from src.utils.reports import show_percentiles
+from src.utils.ui_bench import DEFAULT_BASELINE, DEFAULT_THRESHOLD, run_ui_bench
 from src.utils.visualization import show_execution_visuals
 
 def monitor_process(process, others):
@@ -17,6 +22,28 @@ if __name__ == "__main__":
     if '--graph' in args:
         show_execution_visuals()
         sys.exit()
+    if '--percentiles' in args:
+        index = args.index('--percentiles')
+        show_percentiles(session_id=args[index + 1] if len(args) > index + 1 else None)
+        sys.exit()
+    if '--regressions' in args:
+        index = args.index('--regressions')
+        base, head = args[index + 1], args[index + 2]
+        threshold = float(args[args.index('--threshold') + 1]) if '--threshold' in args else REGRESSION_THRESHOLD
+        alpha = float(args[args.index('--alpha') + 1]) if '--alpha' in args else DEFAULT_ALPHA
+        sys.exit(run_regression_report(base, head, threshold=threshold, alpha=alpha))
+    if '--engine-bench' in args:
+        run_bench()
+        sys.exit()
+    if '--ui-bench' in args:
+        baseline = args[args.index('--baseline') + 1] if '--baseline' in args else DEFAULT_BASELINE
+        threshold = float(args[args.index('--threshold') + 1]) if '--threshold' in args else DEFAULT_THRESHOLD
+        sys.exit(run_ui_bench(baseline, threshold, update_baseline='--update-baseline' in args))
+    if '--import-pgn' in args:
+        path = args[args.index('--import-pgn') + 1]
+        count = import_pgn(get_games_engine(), path)
+        print(f"Imported {count} games from {path}")
+        sys.exit()
 
     # Iniciar las ventanas
     p1 = Popen(["cmd", "/k", "textual console"], creationflags=CREATE_NEW_CONSOLE)
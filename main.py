@@ -1,3 +1,4 @@
 from src.app import ChessApp
 
-ChessApp().run()
+if __name__ == "__main__":
+    ChessApp().run()
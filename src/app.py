@@ -1,15 +1,30 @@
 import tracemalloc
-from typing import Optional
+from typing import Iterable, Optional
 
 import chess
+import chess.pgn
 from chess import Board
 from textual.app import App, ComposeResult
 from textual.containers import Container
-from textual.widgets import DataTable, Footer
+from textual.widgets import Footer
 
+from src.components.analysis_panel import AnalysisPanel
 from src.components.chess_board import ChessBoard
+from src.components.game_browser_screen import GameBrowserScreen
+from src.components.highlight_manager import HighlightManager
+from src.components.move_table import MoveTable
+from src.components.performance_screen import PerformanceScreen
+from src.components.position_search_screen import PositionSearchScreen
+from src.engine.book import OpeningBook
+from src.engine.client import EngineClient
+from src.engine.search import format_score
+from src.utils.board_diff import changed_squares
 from src.utils.debug import timeit
-from .components.chess_square import ChessSquare
+from src.utils.game_end import outcome
+from src.utils.game_history import GameHistory
+from src.utils.game_store import DEFAULT_GAMES_DB
+from src.utils.move_index import MoveIndex
+from src.utils.pgn_index import PgnIndex
 from .components.checkmate_screen import CheckmateScreen
 
 class ChessApp(App):
@@ -30,9 +45,37 @@ class ChessApp(App):
         height: 100%;
         width: 100%;
     }
+    .cell.light {
+        background: #a9a9a9;
+    }
+    .cell.dark {
+        background: #696969;
+    }
+    .cell.last-move {
+        background: #b5b500;
+    }
+    .cell.check {
+        background: #ff0000;
+    }
+    .cell.target {
+        background: #0000ff;
+    }
+    .cell.selected {
+        background: #00ff00;
+    }
+    .cell.white-piece {
+        color: #ffffff;
+    }
+    .cell.black-piece {
+        color: #000000;
+    }
     .move_history {
         width: auto;
-        height: 100%;
+        height: 1fr;
+    }
+    .analysis {
+        height: 3;
+        padding: 0 1;
     }
     .checkmate-message {
         color: #ff0000;
@@ -44,91 +87,270 @@ class ChessApp(App):
         margin: 1;
         align: center middle;
     }
+    .game-browser {
+        width: 90%;
+        height: 90%;
+        background: $panel;
+    }
+    .game-browser-buttons {
+        height: auto;
+    }
+    #pgn-games {
+        height: 1fr;
+    }
+    #performance-activity {
+        height: 3;
+    }
     """
 
     BINDINGS = [
         ("q", "quit", "Quit"),
         ("n", "new_game", "New Game"),
+        ("c", "toggle_computer", "Vs Computer"),
+        ("a", "toggle_analysis", "Analysis"),
+        ("o", "open_pgn", "Open PGN"),
+        ("f", "find_position", "Find Position"),
+        ("p", "show_performance", "Performance"),
+        ("left", "history_back", "Back"),
+        ("right", "history_forward", "Forward"),
+        ("home", "history_start", "Start"),
+        ("end", "history_end", "End"),
     ]
 
     def __init__(self):
         super().__init__()
         self.board = Board()
         self.selected_square: Optional[int] = None
-        self.move_table = DataTable(classes="move_history")
-        self.moves = []
+        self.move_index = MoveIndex(self.board)
+        self.history = GameHistory(self.board)
+        self.moves = self.history.sans
+        self.move_table = MoveTable(self.moves, classes="move_history")
         self.promotion_move = None
-        self.white_board_container = ChessBoard(self.board, invert=False)
-        self.black_board_container = ChessBoard(self.board, invert=True)
-        self.white_board_container.display = True
-        self.black_board_container.display = False
+        self.board_container = ChessBoard(self.board)
+        self.highlights = HighlightManager(self.board_container)
+        self.engine = EngineClient()
+        self.book = OpeningBook()
+        self.analysis_engine = EngineClient(time_limit=None, max_depth=32, nice=10)
+        self.analysis_panel = AnalysisPanel(classes="analysis")
+        self.analysis_enabled = True
+        self.pgn_index: Optional[PgnIndex] = None
+        self.games_db = DEFAULT_GAMES_DB
+        self.computer_color: Optional[chess.Color] = None
 
     def compose(self) -> ComposeResult:
         with Container(id="main"):
-            yield self.white_board_container
-            yield self.black_board_container
+            yield self.board_container
             with Container():
-                self.move_table.add_columns("Move", "White", "Black")
+                yield self.analysis_panel
                 yield self.move_table
 
         yield Footer()
 
-    def action_new_game(self):
-        self.reset_game()
+    async def action_new_game(self):
+        await self.reset_game()
+
+    async def action_toggle_computer(self):
+        """Let the computer play the side that is not to move, or go back to hot-seat play."""
+        if self.computer_color is None:
+            self.computer_color = not self.board.turn
+        else:
+            self.computer_color = None
+            self.cancel_engine()
+        self.update_board_layout()
+        self.start_engine_move()
+
+    def action_toggle_analysis(self):
+        self.analysis_enabled = not self.analysis_enabled
+        self.restart_analysis()
+
+    def on_mount(self):
+        self.restart_analysis()
+
+    def action_open_pgn(self):
+        self.push_screen(GameBrowserScreen(self.pgn_index), self.load_game)
+
+    def action_find_position(self):
+        self.push_screen(PositionSearchScreen(self.board.copy(), self.games_db), self.load_game)
+
+    def action_show_performance(self):
+        self.push_screen(PerformanceScreen())
+
+    def on_unmount(self):
+        self.engine.shutdown()
+        self.analysis_engine.shutdown()
+        self.book.close()
+        if self.pgn_index is not None:
+            self.pgn_index.close()
 
     async def reset_game(self):
+        self.cancel_engine()
         self.board.reset()
-        self.selected_square = None
-        self.moves = []
+        self.history.reset(self.board)
+        await self.show_position()
+        self.start_engine_move()
+
+    async def load_game(self, game: Optional[chess.pgn.Game]):
+        """Replace the current game with ``game``, replaying its mainline into the board and move table."""
+        if game is None:
+            return
+        self.cancel_engine()
+        self.board.set_fen(game.board().fen())
+        self.history.reset(self.board)
+        for move in game.mainline_moves():
+            self.history.push(self.board, move)
         self.move_table.clear()
-        await self.update_board()
+        await self.show_position()
+        self.start_engine_move()
+
+    async def action_history_back(self):
+        await self.seek(self.history.ply - 1)
+
+    async def action_history_forward(self):
+        await self.seek(self.history.ply + 1)
+
+    async def action_history_start(self):
+        await self.seek(0)
+
+    async def action_history_end(self):
+        await self.seek(len(self.history.moves))
+
+    async def on_data_table_cell_selected(self, event: MoveTable.CellSelected):
+        if event.data_table is self.move_table:
+            await self.seek(self.move_table.ply_at(event.coordinate))
 
     @timeit
-    async def update_board(self):
+    async def seek(self, ply: int):
+        """
+        Show the position after ``ply`` moves of the current line, keeping the moves after it.
+        The computer only plays at the end of the line, so stepping through the game does not
+        branch it; earlier on its turn, play is paused until the end is reached again.
+        """
+        if not 0 <= ply <= len(self.history.moves) or ply == self.history.ply:
+            return
+        self.cancel_engine()
+        self.history.seek(self.board, ply)
+        await self.show_position()
+        if self.computer_color != self.board.turn or self.game_outcome() is not None:
+            return
+        if ply == len(self.history.moves):
+            self.start_engine_move()
+        else:
+            self.notify("Computer paused while browsing, press End to resume", timeout=3)
+
+    async def show_position(self):
+        """Redraw everything after the position was replaced rather than advanced by one move."""
+        self.selected_square = None
+        self.move_index.invalidate()
+        self.update_move_table()
+        with self.batch_update():
+            await self.update_board()
+            self.reset_board_colors()
+        self.restart_analysis()
+
+    @timeit
+    async def update_board(self, changed: Optional[Iterable[int]] = None):
+        """
+        Redraw the pieces on the board. When ``changed`` is given only the widgets
+        showing those squares are updated, otherwise every square is redrawn.
+        """
         self.update_board_layout()
-        squares = self.query(ChessSquare)
-        for square in squares:
-            square.update_piece()
+        cells = self.board_container.cells
+        for square in (chess.SQUARES if changed is None else changed):
+            cells[square].update_piece()
 
     @timeit
     def update_board_layout(self):
-        self.white_board_container.display = not self.white_board_container.display
-        self.black_board_container.display = not self.black_board_container.display
+        if self.computer_color is None:
+            self.board_container.set_orientation(invert=not self.board.turn)
+        else:
+            self.board_container.set_orientation(invert=self.computer_color == chess.WHITE)
 
 
     @timeit
     def update_move_table(self):
-        self.move_table.clear()
-        moves = list(self.board.move_stack)
-        for i in range(0, len(moves), 2):
-            white = self.moves[i] if i < len(self.moves) else ""
-            black = self.moves[i + 1] if i+1 < len(self.moves) else ""
-            self.move_table.add_row(str(i//2 + 1), white, black)
+        self.move_table.sync(self.history.take_changed())
+        self.move_table.show_ply(self.history.ply)
 
     @timeit
     def reset_board_colors(self):
-        squares = self.query(ChessSquare)
-        for square in squares:
-            square.styles.background = square._get_bg_color()
+        last_move = self.history.last_move()
+        self.highlights.update(
+            selected=(),
+            targets=(),
+            last_move=(last_move.from_square, last_move.to_square) if last_move else (),
+            check=(self.board.king(self.board.turn),) if self.board.is_check() else (),
+        )
+
+    def game_outcome(self) -> Optional[chess.Outcome]:
+        return outcome(self.board, self.history.repetitions)
 
     @timeit
     def check_game_end(self):
-        if self.board.is_checkmate():
-            winner = "White" if not self.board.turn else "Black"
-            self.push_screen(CheckmateScreen(winner))
+        result = self.game_outcome()
+        if result is not None:
+            self.push_screen(CheckmateScreen(result))
             return True
         return False
 
     async def handle_promotion(self, from_square, to_square, promotion_piece):
-        await self.pop_screen()
-        move = chess.Move(from_square, to_square, promotion_piece)
-        self.moves.append(self.board.san_and_push(move))
-        await self.update_board()
-        self.update_move_table()
-        self.reset_board_colors()
+        for move in self.move_index.find(from_square, to_square):
+            if move.promotion == promotion_piece:
+                await self.push_move(move)
+
+    @timeit
+    async def push_move(self, move: chess.Move):
+        changed = changed_squares(self.board, move)
+        self.history.push(self.board, move)
+        self.move_index.invalidate()
+        with self.batch_update():
+            await self.update_board(changed)
+            self.update_move_table()
+            self.reset_board_colors()
         self.selected_square = None
 
-        self.check_game_end()
+        self.restart_analysis()
+        if not self.check_game_end():
+            self.start_engine_move()
+
+    def restart_analysis(self):
+        """Cancel the analysis in flight and, if enabled, start analysing the current position."""
+        self.analysis_engine.cancel()
+        self.workers.cancel_group(self, "analysis")
+        if not self.analysis_enabled:
+            self.analysis_panel.show_message("Analysis off")
+            return
+        if self.game_outcome() is not None:
+            self.analysis_panel.show_message("Game over")
+            return
+        self.analysis_panel.show_message("Analysing...")
+        self.run_worker(self.analyse_position(self.board.copy()), group="analysis", exclusive=True)
+
+    async def analyse_position(self, board: chess.Board):
+        await self.analysis_engine.analyse(board, lambda result: self.analysis_panel.show_result(board, result))
+
+    def start_engine_move(self):
+        if self.computer_color is not None and self.computer_color == self.board.turn:
+            self.run_worker(self.play_engine_move(), group="engine", exclusive=True)
+
+    def cancel_engine(self):
+        self.engine.cancel()
+        self.workers.cancel_group(self, "engine")
+
+    @timeit
+    async def play_engine_move(self):
+        book_move = self.book.choose(self.board)
+        if book_move is not None:
+            await self.push_move(book_move)
+            return
+
+        result = await self.engine.search(self.board)
+        if result is None or self.computer_color != self.board.turn:
+            return
+        move = chess.Move.from_uci(result.move)
+        if move not in self.move_index.find(move.from_square, move.to_square):
+            return
+        self.notify(f"Engine: depth {result.depth}, {format_score(result.score)}, {result.nps} nps", timeout=3)
+        await self.push_move(move)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,25 @@
+from chess import Board, Move
+from textual.widgets import Static
+
+from src.engine.search import SearchResult, format_score
+
+
+class AnalysisPanel(Static):
+    """
+    Shows the latest analysis of the current position: depth, score (from white's
+    point of view), engine speed and the principal variation in SAN.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__("", **kwargs)
+
+    def show_result(self, board: Board, result: SearchResult):
+        score = result.score if board.turn else -result.score
+        try:
+            line = board.variation_san([Move.from_uci(move) for move in result.pv])
+        except ValueError:
+            line = " ".join(result.pv)
+        self.update(f"Depth {result.depth}  {format_score(score)}  {result.nps} nps\n{line}")
+
+    def show_message(self, message: str):
+        self.update(message)
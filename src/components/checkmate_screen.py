@@ -1,13 +1,18 @@
+from chess import Outcome
 from textual.app import ComposeResult
 from textual.containers import Container
 from textual.screen import ModalScreen
 from textual.widgets import Label, Button, Static
 
+from ..utils.game_end import describe
+
 
 class CheckmateScreen(ModalScreen):
-    def __init__(self, winner: str):
+    """Shown when the game ends, with its result and the reason (checkmate or the kind of draw)."""
+
+    def __init__(self, outcome: Outcome):
         super().__init__()
-        self.winner = winner
+        self.outcome = outcome
 
     @property
     def app(self) -> 'ChessApp':
@@ -18,7 +23,7 @@ class CheckmateScreen(ModalScreen):
 
     def compose(self) -> ComposeResult:
         yield Container(
-            Static(f"Checkmate! {self.winner} wins!", classes="checkmate-message"),
+            Static(describe(self.outcome), classes="checkmate-message"),
             Button("New Game", id="new-game", classes="checkmate-button"),
             Button("Quit", id="quit", classes="checkmate-button")
         )
@@ -26,6 +31,6 @@ class CheckmateScreen(ModalScreen):
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "new-game":
             self.app.pop_screen()
-            self.app.reset_game()
+            self.app.call_later(self.app.reset_game)
         elif event.button.id == "quit":
             self.app.exit()
\ No newline at end of file
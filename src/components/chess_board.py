@@ -1,26 +1,52 @@
+from typing import List, Optional
+
 import numpy as np
 from chess import Board, SQUARES
 from textual.containers import Container
 
 from src.components.chess_square import ChessSquare
+from src.utils.debug import timeit
 
 
 class ChessBoard(Container):
     """
     ChessBoard is a container that represents the chessboard in the chess game.
     It is a grid layout that contains 64 squares, each represented by a ChessSquare widget.
+
+    The orientation is a mapping from view cell to square (``self.squares``). Every widget
+    keeps its square for good, so turning the board around only reorders the children of
+    the grid: no widget is remounted or redrawn.
+    ``self.cells`` is the inverse lookup: a 64-entry list from square index to its widget.
     """
 
     def __init__(self, board: Board, invert=False):
         super().__init__(classes="chess_board")
         self.board = board
+        self.invert = invert
         self.squares = np.flipud(np.array(SQUARES).reshape(8, 8)).flatten()
         if invert:
             self.squares = np.flip(self.squares)
+        self.cells: List[Optional[ChessSquare]] = [None] * 64
 
     def compose(self):
         """
         Compose the chessboard by yielding ChessSquare widgets for each square.
         """
         for square in self.squares:
-            yield ChessSquare(square, self.board)
\ No newline at end of file
+            cell = ChessSquare(int(square), self.board)
+            self.cells[square] = cell
+            yield cell
+
+    @timeit
+    def set_orientation(self, invert: bool):
+        """
+        Show the board from black's side when ``invert`` is true, white's otherwise.
+        Turning the board around maps view cell ``i`` to the square of cell ``63 - i``,
+        which is done by reversing the order of the grid children.
+        """
+        if invert == self.invert:
+            return
+        self.invert = invert
+        self.squares = np.flip(self.squares)
+        view_cell = np.argsort(self.squares)
+        self.sort_children(key=lambda cell: view_cell[cell.square])
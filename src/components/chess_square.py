@@ -5,36 +5,32 @@ from chess import Board
 from textual.widgets import Label
 
 from .promotion_screen import PromotionScreen
-from ..utils.colors import Color
 from ..utils.debug import timeit
 
 if TYPE_CHECKING:
     from src.app import ChessApp
 
 class ChessSquare(Label):
+    """
+    A single board cell. Its look is driven by CSS classes declared in ``ChessApp.CSS``:
+    ``light``/``dark`` for the square color, ``white-piece``/``black-piece`` for the piece,
+    and the highlight classes toggled by ``HighlightManager``.
+    """
+
     def __init__(self, square: int, board: Board):
-        super().__init__(classes="cell")
+        super().__init__(classes=f"cell {self._square_class(square)}")
         self.square = square
         self.board = board
-        self.styles.background = self._get_bg_color()
         self.update_piece()
 
     @property
     def app(self) -> "ChessApp":
         return super().app # type: ignore
 
-    @timeit
-    def swap(self, other: 'ChessSquare'):
-        self.styles.background, other.styles.background = other.styles.background, self.styles.background
-        self.styles.color, other.styles.color = other.styles.color, self.styles.color
-        self.square, other.square = other.square, self.square
-        self.id, other.id = other.id, self.id
-        self.update_piece()
-        other.update_piece()
-
-    def _get_bg_color(self):
-        file, rank = chess.square_file(self.square), chess.square_rank(self.square)
-        return Color.LIGHT_GRAY.value if (file + rank) % 2 == 0 else Color.DARK_GRAY.value
+    @staticmethod
+    def _square_class(square: int) -> str:
+        file, rank = chess.square_file(square), chess.square_rank(square)
+        return "light" if (file + rank) % 2 == 0 else "dark"
 
     symbol_dict = {
         "p": "♟",
@@ -54,15 +50,15 @@ class ChessSquare(Label):
     @timeit
     def update_piece(self):
         piece = self.board.piece_at(self.square)
-        if piece:
-            self.update(self.symbol_dict[piece.symbol()])
-            self.styles.color = Color.WHITE.value if piece.color else Color.BLACK.value
-        else:
-            self.update(" ")
+        self.update(self.symbol_dict[piece.symbol()] if piece else " ")
+        self.set_class(piece is not None and piece.color, "white-piece")
+        self.set_class(piece is not None and not piece.color, "black-piece")
 
     def on_click(self):
         @timeit
         async def process():
+            if self.app.computer_color == self.board.turn:
+                return
             if self.app.selected_square is None:
                 if self.board.color_at(self.square) == self.board.turn:
                     self._select_square()
@@ -72,35 +68,22 @@ class ChessSquare(Label):
         self.call_after_refresh(process)
 
     def _select_square(self):
-        self.styles.background = Color.GREEN.value
         self.app.selected_square = self.square
-        for move in self.board.legal_moves:
-            if move.from_square == self.square:
-                target_square = filter(lambda sq: sq.square == move.to_square, self.app.query(ChessSquare).results())
-                for sq in target_square: sq.styles.background = Color.BLUE.value
+        self.app.highlights.update(selected=[self.square], targets=self.app.move_index.targets(self.square))
 
     @timeit
     async def _try_move(self):
         try:
-            moves = list(filter(
-                lambda move: move.from_square == self.app.selected_square and
-                             move.to_square == self.square,
-                self.board.legal_moves
-            ))
+            moves = self.app.move_index.find(self.app.selected_square, self.square)
 
             if moves:
                 move = moves[0]
 
                 if move.promotion:
-                    async def handle_promotion(p):
-                        await self.app.handle_promotion(self.app.selected_square, self.square, p)
+                    def handle_promotion(p):
+                        self.app.call_later(self.app.handle_promotion, move.from_square, move.to_square, p)
                     await self.app.push_screen(PromotionScreen(self.board.turn, handle_promotion))
                 else:
-                    self.app.moves.append(self.board.san_and_push(move))
-                    await self.app.update_board()
-                    self.app.update_move_table()
-                    self.app.reset_board_colors()
-                    self.app.selected_square = None
-                    self.app.check_game_end()
+                    await self.app.push_move(move)
         finally:
             pass
@@ -0,0 +1,108 @@
+import struct
+from typing import TYPE_CHECKING, Optional
+
+from textual import work
+from textual.app import ComposeResult
+from textual.containers import Container, Horizontal
+from textual.screen import ModalScreen
+from textual.widgets import Button, DataTable, Input, Static
+
+from ..utils.pgn_index import PgnIndex
+
+if TYPE_CHECKING:
+    from src.app import ChessApp
+
+
+class GameBrowserScreen(ModalScreen):
+    """
+    Opens a PGN database and lists its games one page at a time. Only the headers of the
+    games on the current page are read; a game is parsed when it is selected and then
+    handed back to the app through ``dismiss``.
+    """
+
+    PAGE_SIZE = 100
+
+    BINDINGS = [
+        ("escape", "dismiss", "Close"),
+    ]
+
+    def __init__(self, index: Optional[PgnIndex] = None):
+        super().__init__()
+        self.index = index
+        self.page = 0
+
+    @property
+    def app(self) -> "ChessApp":
+        return super().app # type: ignore
+
+    def compose(self) -> ComposeResult:
+        with Container(classes="game-browser"):
+            yield Input(
+                value=self.index.path if self.index else "",
+                placeholder="Path to a PGN file",
+                id="pgn-path",
+            )
+            yield Static("", id="pgn-status")
+            yield DataTable(id="pgn-games", cursor_type="row")
+            with Horizontal(classes="game-browser-buttons"):
+                yield Button("Previous", id="previous-page")
+                yield Button("Next", id="next-page")
+
+    def on_mount(self):
+        self.query_one("#pgn-games", DataTable).add_columns("#", "White", "Black", "Result", "Date", "Event")
+        if self.index is not None:
+            self.show_page(self.page)
+
+    def on_input_submitted(self, event: Input.Submitted):
+        self.query_one("#pgn-status", Static).update("Indexing...")
+        self.open_index(event.value.strip())
+
+    @work(thread=True, exclusive=True)
+    def open_index(self, path: str):
+        try:
+            index = PgnIndex.open(path)
+        except (OSError, ValueError, struct.error) as e:
+            self.app.call_from_thread(self.query_one("#pgn-status", Static).update, f"Error: {e}")
+            return
+        self.app.call_from_thread(self._index_ready, index)
+
+    def _index_ready(self, index: PgnIndex):
+        if self.index is not None and self.index is not index:
+            self.index.close()
+        self.index = index
+        self.app.pgn_index = index
+        self.show_page(0)
+
+    def show_page(self, page: int):
+        pages = max(1, -(-len(self.index) // self.PAGE_SIZE))
+        self.page = min(max(page, 0), pages - 1)
+        table = self.query_one("#pgn-games", DataTable)
+        table.clear()
+        start = self.page * self.PAGE_SIZE
+        for number in range(start, min(start + self.PAGE_SIZE, len(self.index))):
+            headers = self.index.read_headers(number)
+            table.add_row(
+                str(number + 1),
+                headers.get("White", "?"),
+                headers.get("Black", "?"),
+                headers.get("Result", "*"),
+                headers.get("Date", ""),
+                headers.get("Event", ""),
+                key=str(number),
+            )
+        self.query_one("#pgn-status", Static).update(
+            f"{len(self.index)} games, page {self.page + 1}/{pages}"
+        )
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if self.index is None:
+            return
+        if event.button.id == "previous-page":
+            self.show_page(self.page - 1)
+        elif event.button.id == "next-page":
+            self.show_page(self.page + 1)
+
+    def on_data_table_row_selected(self, event: DataTable.RowSelected):
+        game = self.index.read_game(int(event.row_key.value))
+        if game is not None:
+            self.dismiss(game)
@@ -0,0 +1,42 @@
+from typing import Dict, Iterable, Set
+
+from src.components.chess_board import ChessBoard
+from src.utils.debug import timeit
+
+
+class HighlightManager:
+    """
+    Keeps track of which squares are highlighted and why, so clearing a highlight only
+    touches the squares that were actually marked.
+
+    Each layer maps to a CSS class on ``ChessSquare``; when a square is in several layers
+    the rule declared last in ``ChessApp.CSS`` wins.
+    """
+
+    LAYERS = {
+        "last_move": "last-move",
+        "check": "check",
+        "targets": "target",
+        "selected": "selected",
+    }
+
+    def __init__(self, board: ChessBoard):
+        self.board = board
+        self.layers: Dict[str, Set[int]] = {layer: set() for layer in self.LAYERS}
+
+    @timeit
+    def update(self, **layers: Iterable[int]):
+        """
+        Replace the squares of the given layers, e.g. ``update(selected=[sq], targets=[])``,
+        toggling classes only on the squares whose highlight changed, in a single batch.
+        """
+        cells = self.board.cells
+        with self.board.app.batch_update():
+            for layer, squares in layers.items():
+                css_class = self.LAYERS[layer]
+                old, new = self.layers[layer], set(squares)
+                for square in old - new:
+                    cells[square].remove_class(css_class)
+                for square in new - old:
+                    cells[square].add_class(css_class)
+                self.layers[layer] = new
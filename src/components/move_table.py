@@ -0,0 +1,79 @@
+from typing import List, Optional
+
+from textual.binding import Binding
+from textual.coordinate import Coordinate
+from textual.widgets import DataTable
+
+
+class MoveTable(DataTable):
+    """
+    Move history table. The SAN list ``moves`` is the backing store: ``sync`` appends a row
+    or fills in the black cell of the last row for each new ply, instead of rebuilding the
+    table. DataTable only renders the rows in view, so long games stay cheap to display.
+
+    Selecting a move cell jumps to the position after that move; the arrow keys step
+    through the game instead of moving the cursor sideways.
+    """
+
+    BINDINGS = [
+        Binding("left", "app.history_back", "Back", show=False),
+        Binding("right", "app.history_forward", "Forward", show=False),
+        Binding("home", "app.history_start", "Start", show=False),
+        Binding("end", "app.history_end", "End", show=False),
+    ]
+
+    def __init__(self, moves: List[str], **kwargs):
+        super().__init__(**kwargs)
+        self.moves = moves
+        self._rendered = 0
+
+    def on_mount(self):
+        self.add_column("Move", key="move")
+        self.add_column("White", key="white")
+        self.add_column("Black", key="black")
+
+    def clear(self, columns: bool = False):
+        """Remove every row, for a game that replaces the current one rather than extending it."""
+        self._rendered = 0
+        return super().clear(columns)
+
+    def sync(self, changed_from: Optional[int] = None):
+        """
+        Bring the rows in line with ``self.moves``, touching only the plies that changed. Plies
+        from ``changed_from`` on are rendered again, for moves replaced by a new line.
+        """
+        moves = self.moves
+        keep = len(moves) if changed_from is None else min(changed_from, len(moves))
+        if keep < self._rendered:
+            self._truncate(keep)
+
+        ply = self._rendered
+        if ply % 2 == 1 and ply < len(moves):
+            self.update_cell(str(ply // 2), "black", moves[ply])
+            ply += 1
+        for i in range(ply, len(moves), 2):
+            black = moves[i + 1] if i + 1 < len(moves) else ""
+            self.add_row(str(i // 2 + 1), moves[i], black, key=str(i // 2))
+        self._rendered = len(moves)
+
+    def show_ply(self, ply: int):
+        """Put the cursor on the move that leads to ``ply`` (the move-number cell for the start)."""
+        if ply == 0 or self.row_count == 0:
+            self.move_cursor(row=0, column=0, scroll=True)
+        else:
+            self.move_cursor(row=(ply - 1) // 2, column=2 - ply % 2, scroll=True)
+
+    @staticmethod
+    def ply_at(coordinate: Coordinate) -> int:
+        """Ply reached after the move in the cell at ``coordinate``; the move number means the ply before it."""
+        return coordinate.row * 2 + coordinate.column
+
+    def _truncate(self, plies: int):
+        if plies == 0:
+            self.clear()
+        else:
+            for row in range((plies + 1) // 2, (self._rendered + 1) // 2):
+                self.remove_row(str(row))
+            if plies % 2 == 1:
+                self.update_cell(str(plies // 2), "black", "")
+        self._rendered = plies
@@ -0,0 +1,76 @@
+from typing import TYPE_CHECKING
+
+from textual.app import ComposeResult
+from textual.containers import Container
+from textual.screen import ModalScreen
+from textual.widgets import DataTable, Sparkline, Static
+
+from ..utils.debug import current_tracker
+from ..utils.histogram import format_ns
+from ..utils.live_stats import LiveStats, sparkline
+
+if TYPE_CHECKING:
+    from src.app import ChessApp
+
+
+class PerformanceScreen(ModalScreen):
+    """
+    Live view of the ``@timeit`` data of the running app: calls, recent p50/p95/p99/max and
+    activity per function, refreshed every ``REFRESH_INTERVAL`` seconds from the in-memory
+    recorder. Each refresh only reads the calls made since the previous one (see ``LiveStats``).
+    """
+
+    REFRESH_INTERVAL = 1.0
+
+    BINDINGS = [
+        ("escape", "dismiss", "Close"),
+    ]
+
+    COLUMNS = ("Function", "Calls", "p50", "p95", "p99", "Max", "Activity")
+
+    def __init__(self):
+        super().__init__()
+        tracker = current_tracker()
+        self.stats = LiveStats(tracker.recorder) if tracker is not None else None
+
+    @property
+    def app(self) -> "ChessApp":
+        return super().app # type: ignore
+
+    def compose(self) -> ComposeResult:
+        with Container(classes="game-browser"):
+            yield Static("", id="performance-summary")
+            yield Sparkline([], id="performance-activity")
+            yield DataTable(id="performance-functions", cursor_type="row")
+
+    def on_mount(self):
+        table = self.query_one("#performance-functions", DataTable)
+        for column in self.COLUMNS:
+            table.add_column(column, key=column.lower())
+        if self.stats is None:
+            self.query_one("#performance-summary", Static).update("Profiling is disabled (CHESS_PROFILE=0)")
+            return
+        self.refresh_stats()
+        self.set_interval(self.REFRESH_INTERVAL, self.refresh_stats)
+
+    def refresh_stats(self):
+        stats = self.stats
+        read = stats.update()
+        skipped = f", {stats.skipped} skipped" if stats.skipped else ""
+        self.query_one("#performance-summary", Static).update(
+            f"{sum(stats.calls.values())} calls, {read / self.REFRESH_INTERVAL:.0f}/s{skipped}"
+        )
+        self.query_one("#performance-activity", Sparkline).data = list(stats.total_activity)
+
+        table = self.query_one("#performance-functions", DataTable)
+        for name in sorted(stats.durations, key=lambda name: stats.calls[name], reverse=True):
+            values = (
+                str(stats.calls[name]),
+                *(format_ns(value) for value in stats.percentiles(name)),
+                sparkline(stats.activity[name]),
+            )
+            if name in table.rows:
+                for column, value in zip(self.COLUMNS[1:], values):
+                    table.update_cell(name, column.lower(), value)
+            else:
+                table.add_row(name, *values, key=name)
@@ -0,0 +1,76 @@
+from typing import TYPE_CHECKING
+
+from chess import Board
+from sqlalchemy.exc import SQLAlchemyError
+from textual import work
+from textual.app import ComposeResult
+from textual.containers import Container
+from textual.screen import ModalScreen
+from textual.widgets import DataTable, Static
+
+from ..utils.game_store import PositionSearch, find_position, get_games_engine, to_pgn_game
+
+if TYPE_CHECKING:
+    from src.app import ChessApp
+
+
+class PositionSearchScreen(ModalScreen):
+    """
+    Lists the stored games that reached a position, with white/draw/black statistics.
+    Selecting a game hands it back to the app through ``dismiss``.
+    """
+
+    BINDINGS = [
+        ("escape", "dismiss", "Close"),
+    ]
+
+    def __init__(self, board: Board, db_path: str):
+        super().__init__()
+        self.board = board
+        self.db_path = db_path
+        self.games = {}
+
+    @property
+    def app(self) -> "ChessApp":
+        return super().app # type: ignore
+
+    def compose(self) -> ComposeResult:
+        with Container(classes="game-browser"):
+            yield Static("Searching...", id="position-stats")
+            yield DataTable(id="position-games", cursor_type="row")
+
+    def on_mount(self):
+        self.query_one("#position-games", DataTable).add_columns("White", "Black", "Result", "Date", "Ply")
+        self.search()
+
+    @work(thread=True, exclusive=True)
+    def search(self):
+        try:
+            engine = get_games_engine(self.db_path)
+            try:
+                result = find_position(engine, self.board)
+            finally:
+                engine.dispose()
+        except SQLAlchemyError as e:
+            # The first line names the error; the rest is SQLAlchemy's link to its docs.
+            message = str(e).splitlines()[0]
+            self.app.call_from_thread(self.query_one("#position-stats", Static).update, f"Error: {message}")
+            return
+        self.app.call_from_thread(self.show_result, result)
+
+    def show_result(self, result: PositionSearch):
+        if result.total:
+            stats = (f"{result.total} games: white wins {result.white_wins * 100 // result.total}%, "
+                     f"draws {result.draws * 100 // result.total}%, black wins {result.black_wins * 100 // result.total}%")
+        else:
+            stats = "No stored game reached this position"
+        self.query_one("#position-stats", Static).update(stats)
+
+        table = self.query_one("#position-games", DataTable)
+        for game, ply in result.games:
+            self.games[str(game.id)] = game
+            table.add_row(game.white or "?", game.black or "?", game.result or "*", game.date or "", str(ply),
+                          key=str(game.id))
+
+    def on_data_table_row_selected(self, event: DataTable.RowSelected):
+        self.dismiss(to_pgn_game(self.games[event.row_key.value]))
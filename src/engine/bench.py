@@ -0,0 +1,33 @@
+import time
+
+import chess
+
+from src.engine.search import Searcher
+
+BENCH_POSITIONS = [
+    chess.STARTING_FEN,
+    "r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 3 3",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "r2q1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP2BPPP/R2Q1RK1 w - - 0 10",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1",
+]
+
+
+def run_bench(depth: int = 4):
+    """
+    Search a fixed set of positions to a fixed depth and print the node count and
+    nodes per second, so engine throughput can be compared between releases.
+    """
+    total_nodes = 0
+    start = time.perf_counter()
+    for fen in BENCH_POSITIONS:
+        result = Searcher().search(chess.Board(fen), max_depth=depth)
+        total_nodes += result.nodes
+        print(f"{fen:<72} depth {result.depth:>2}  nodes {result.nodes:>8}  nps {result.nps:>7}")
+    elapsed = time.perf_counter() - start
+    print(f"Total: {total_nodes} nodes in {elapsed:.2f}s ({int(total_nodes / elapsed)} nps)")
+
+
+if __name__ == "__main__":
+    run_bench()
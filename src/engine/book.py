@@ -0,0 +1,50 @@
+import os
+import sys
+from typing import Optional
+
+import chess.polyglot
+from chess import Board, Move
+
+DEFAULT_BOOK_PATH = "book.bin"
+
+
+class OpeningBook:
+    """
+    Polyglot opening book.
+
+    The file is memory-mapped on the first lookup (``chess.polyglot.MemoryMappedReader``) and each
+    lookup binary-searches the sorted entries for the position key, so the book is never read into
+    memory or parsed up front and startup time does not depend on its size.
+    The path defaults to the ``CHESS_BOOK`` environment variable, then ``book.bin``.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.environ.get("CHESS_BOOK", DEFAULT_BOOK_PATH)
+        self._reader: Optional[chess.polyglot.MemoryMappedReader] = None
+        self._unavailable = False
+
+    def _get_reader(self) -> Optional[chess.polyglot.MemoryMappedReader]:
+        if self._reader is None and not self._unavailable:
+            try:
+                self._reader = chess.polyglot.open_reader(self.path)
+            except FileNotFoundError:
+                self._unavailable = True
+            except OSError as e:
+                print(f"Error opening book {self.path}: {e}", file=sys.stderr)
+                self._unavailable = True
+        return self._reader
+
+    def choose(self, board: Board) -> Optional[Move]:
+        """A weighted random book move for ``board``, or None when the position is not in the book."""
+        reader = self._get_reader()
+        if reader is None:
+            return None
+        try:
+            return reader.weighted_choice(board).move
+        except IndexError:
+            return None
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
@@ -0,0 +1,134 @@
+import asyncio
+import multiprocessing
+import os
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from chess import Board
+
+from src.engine.search import Searcher, SearchResult
+
+# Per-process state of the pool worker, set up by ``_init_worker``.
+_generation = None
+_updates = None
+_searcher: Optional[Searcher] = None
+
+
+def _init_worker(generation, updates, nice):
+    global _generation, _updates, _searcher
+    if nice and hasattr(os, "nice"):
+        os.nice(nice)
+    _generation = generation
+    _updates = updates
+    _searcher = Searcher()
+
+
+def _run_search(
+        board: Board,
+        token: int,
+        max_depth: int,
+        time_limit: Optional[float],
+        stream: bool = False,
+) -> Optional[SearchResult]:
+    return _searcher.search(
+        board,
+        max_depth=max_depth,
+        time_limit=time_limit,
+        should_stop=lambda: _generation.value != token,
+        on_depth=(lambda result: _updates.put((token, result))) if stream else None,
+    )
+
+
+class EngineClient:
+    """
+    Runs ``Searcher`` in a single-process pool so the Textual event loop never blocks on a search.
+
+    The worker process is started lazily on the first search and keeps its transposition table
+    between searches. ``cancel`` bumps a shared generation counter that the running search polls,
+    so a cancelled search stops within a few thousand nodes and frees the worker.
+    ``analyse`` streams the result of every completed depth back through a queue.
+    ``nice`` lowers the worker's scheduling priority (POSIX only) for background analysis.
+    """
+
+    def __init__(self, time_limit: Optional[float] = 2.0, max_depth: int = 64, nice: int = 0):
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.nice = nice
+        self._context = multiprocessing.get_context("spawn")
+        self._generation = self._context.Value("i", 0)
+        self._updates = self._context.Queue()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=self._context,
+                initializer=_init_worker,
+                initargs=(self._generation, self._updates, self.nice),
+            )
+        return self._pool
+
+    async def search(self, board: Board) -> Optional[SearchResult]:
+        """
+        Search ``board`` in the worker process. Returns None if the search was cancelled
+        or the position has no legal moves.
+        """
+        token = self._generation.value
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            self._get_pool(), _run_search, board.copy(), token, self.max_depth, self.time_limit
+        )
+        return result if token == self._generation.value else None
+
+    async def analyse(
+            self,
+            board: Board,
+            on_result: Callable[[SearchResult], None],
+            interval: float = 0.1,
+    ) -> Optional[SearchResult]:
+        """
+        Search ``board`` until ``max_depth``, ``time_limit`` or ``cancel``, calling ``on_result``
+        with the deepest completed result at most once every ``interval`` seconds.
+        Intermediate depths finished within the same interval are skipped.
+        """
+        token = self._generation.value
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._get_pool(), _run_search, board.copy(), token, self.max_depth, self.time_limit, True
+        )
+        while not future.done():
+            await asyncio.sleep(interval)
+            latest = self._drain_updates(token)
+            if latest is not None and token == self._generation.value:
+                on_result(latest)
+
+        result = await future
+        self._drain_updates(token)
+        if token != self._generation.value:
+            return None
+        if result is not None:
+            on_result(result)
+        return result
+
+    def _drain_updates(self, token: int) -> Optional[SearchResult]:
+        latest = None
+        while True:
+            try:
+                update_token, result = self._updates.get_nowait()
+            except queue.Empty:
+                return latest
+            if update_token == token:
+                latest = result
+
+    def cancel(self):
+        """Stop the search in flight, if any."""
+        with self._generation.get_lock():
+            self._generation.value += 1
+
+    def shutdown(self):
+        self.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
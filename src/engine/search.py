@@ -0,0 +1,313 @@
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+import chess
+from chess import Board, Move
+from chess.polyglot import zobrist_hash
+
+from src.engine.evaluation import PIECE_VALUES, evaluate
+from src.utils import zobrist
+
+MATE = 100_000
+INFINITY = 1_000_000
+MAX_PLY = 128
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+@dataclass
+class SearchResult:
+    """Outcome of a completed search depth. ``score`` is in centipawns for the side to move."""
+    depth: int
+    score: int
+    pv: List[str] = field(default_factory=list)
+    nodes: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def move(self) -> Optional[str]:
+        return self.pv[0] if self.pv else None
+
+    @property
+    def nps(self) -> int:
+        return int(self.nodes / self.elapsed) if self.elapsed > 0 else 0
+
+
+def format_score(score: int) -> str:
+    """Render a score as pawns (``+0.35``) or as a mate distance in moves (``#3``, ``#-2``)."""
+    if abs(score) >= MATE - MAX_PLY:
+        plies = MATE - abs(score)
+        moves = (plies + 1) // 2
+        return f"#{moves}" if score > 0 else f"#-{moves}"
+    return f"{score / 100:+.2f}"
+
+
+class SearchStopped(Exception):
+    pass
+
+
+class TranspositionTable:
+    """
+    Fixed-size, always-replace hash table indexed by the low bits of the Zobrist key.
+    ``size`` is rounded down to a power of two and caps the number of entries.
+    """
+
+    def __init__(self, size: int = 1 << 18):
+        self.size = 1 << (max(size, 1).bit_length() - 1)
+        self._mask = self.size - 1
+        self._entries: List[Optional[tuple]] = [None] * self.size
+
+    def get(self, key: int) -> Optional[tuple]:
+        entry = self._entries[key & self._mask]
+        return entry if entry is not None and entry[0] == key else None
+
+    def put(self, key: int, depth: int, score: int, flag: int, move: Optional[Move]):
+        self._entries[key & self._mask] = (key, depth, score, flag, move)
+
+    def clear(self):
+        self._entries = [None] * self.size
+
+
+class Searcher:
+    """
+    Alpha-beta (negamax) search with iterative deepening, a Zobrist-keyed transposition
+    table, killer/history move ordering and a captures-only quiescence search.
+
+    The transposition table and history survive between calls, so consecutive searches
+    on related positions reuse earlier work.
+    """
+
+    CHECK_EVERY = 1024
+
+    def __init__(self, tt_size: int = 1 << 18):
+        self.tt = TranspositionTable(tt_size)
+        self.history = [0] * 4096
+        self.killers: List[List[Optional[Move]]] = [[None, None] for _ in range(MAX_PLY)]
+        self.nodes = 0
+        self._keys: List[int] = []
+        self._deadline: Optional[float] = None
+        self._should_stop: Optional[Callable[[], bool]] = None
+
+    def search(
+            self,
+            board: Board,
+            max_depth: int = 64,
+            time_limit: Optional[float] = None,
+            should_stop: Optional[Callable[[], bool]] = None,
+            on_depth: Optional[Callable[[SearchResult], None]] = None,
+    ) -> Optional[SearchResult]:
+        """
+        Search ``board`` with increasing depth until ``max_depth`` is reached, ``time_limit``
+        seconds have passed or ``should_stop`` returns true. ``on_depth`` is called with the
+        result of every completed depth. Returns the deepest completed result.
+        """
+        board = board.copy()
+        start = time.perf_counter()
+        self.nodes = 0
+        self._deadline = start + time_limit if time_limit is not None else None
+        self._should_stop = should_stop
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self._keys = self._history_keys(board)
+        root_key = zobrist_hash(board)
+        root_stack = len(board.move_stack)
+
+        best = None
+        for depth in range(1, max_depth + 1):
+            try:
+                score = self._negamax(board, root_key, depth, -INFINITY, INFINITY, 0)
+            except SearchStopped:
+                while len(board.move_stack) > root_stack:
+                    board.pop()
+                break
+            result = SearchResult(
+                depth=depth,
+                score=score,
+                pv=[move.uci() for move in self._principal_variation(board, root_key, depth)],
+                nodes=self.nodes,
+                elapsed=time.perf_counter() - start,
+            )
+            if not result.pv:
+                break
+            best = result
+            if on_depth is not None:
+                on_depth(result)
+            if abs(score) >= MATE - MAX_PLY:
+                break
+        return best
+
+    @staticmethod
+    def _history_keys(board: Board) -> List[int]:
+        """Keys of the positions since the last irreversible move, for repetition detection."""
+        board = board.copy()
+        keys = []
+        for _ in range(min(board.halfmove_clock, len(board.move_stack))):
+            board.pop()
+            keys.append(zobrist_hash(board))
+        keys.reverse()
+        return keys
+
+    def _check_stop(self):
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise SearchStopped()
+        if self._should_stop is not None and self._should_stop():
+            raise SearchStopped()
+
+    def _is_repetition(self, board: Board, key: int) -> bool:
+        keys = self._keys
+        limit = min(board.halfmove_clock, len(keys))
+        for i in range(2, limit + 1, 2):
+            if keys[-i] == key:
+                return True
+        return False
+
+    def _push(self, board: Board, move: Move, key: int) -> int:
+        self._keys.append(key)
+        return zobrist.push(board, move, key)
+
+    def _pop(self, board: Board):
+        board.pop()
+        self._keys.pop()
+
+    def _negamax(self, board: Board, key: int, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if self.nodes % self.CHECK_EVERY == 0:
+            self._check_stop()
+
+        if ply > 0:
+            if board.halfmove_clock >= 100 or self._is_repetition(board, key):
+                return 0
+            if board.is_insufficient_material():
+                return 0
+
+        in_check = board.is_check()
+        if in_check:
+            depth += 1
+        if depth <= 0 or ply >= MAX_PLY - 1:
+            return self._quiesce(board, key, alpha, beta, ply)
+
+        tt_move = None
+        entry = self.tt.get(key)
+        if entry is not None:
+            _, entry_depth, entry_score, flag, tt_move = entry
+            if ply > 0 and entry_depth >= depth:
+                score = self._score_from_tt(entry_score, ply)
+                if flag == EXACT:
+                    return score
+                if flag == LOWER and score >= beta:
+                    return score
+                if flag == UPPER and score <= alpha:
+                    return score
+
+        moves = self._ordered_moves(board, tt_move, ply)
+        if not moves:
+            return -MATE + ply if in_check else 0
+
+        original_alpha = alpha
+        best_score, best_move = -INFINITY, None
+        for move in moves:
+            child = self._push(board, move, key)
+            score = -self._negamax(board, child, depth - 1, -beta, -alpha, ply + 1)
+            self._pop(board)
+
+            if score > best_score:
+                best_score, best_move = score, move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if not board.is_capture(move):
+                    self._remember_cutoff(move, depth, ply)
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.put(key, depth, self._score_to_tt(best_score, ply), flag, best_move)
+        return best_score
+
+    def _quiesce(self, board: Board, key: int, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if self.nodes % self.CHECK_EVERY == 0:
+            self._check_stop()
+
+        stand_pat = evaluate(board)
+        if stand_pat >= beta or ply >= MAX_PLY - 1:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+
+        captures = sorted(board.generate_legal_captures(), key=lambda m: self._capture_score(board, m), reverse=True)
+        for move in captures:
+            child = self._push(board, move, key)
+            score = -self._quiesce(board, child, -beta, -alpha, ply + 1)
+            self._pop(board)
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+    @staticmethod
+    def _capture_score(board: Board, move: Move) -> int:
+        """Most valuable victim, least valuable attacker."""
+        victim = board.piece_type_at(move.to_square) or chess.PAWN
+        attacker = board.piece_type_at(move.from_square)
+        return PIECE_VALUES[victim] * 10 - PIECE_VALUES[attacker]
+
+    def _ordered_moves(self, board: Board, tt_move: Optional[Move], ply: int) -> List[Move]:
+        killers = self.killers[ply]
+        history = self.history
+
+        def score(move: Move) -> int:
+            if move == tt_move:
+                return 10_000_000
+            if board.is_capture(move):
+                return 1_000_000 + self._capture_score(board, move)
+            if move.promotion:
+                return 900_000 + move.promotion
+            if move == killers[0]:
+                return 800_000
+            if move == killers[1]:
+                return 700_000
+            return history[move.from_square * 64 + move.to_square]
+
+        return sorted(board.legal_moves, key=score, reverse=True)
+
+    def _remember_cutoff(self, move: Move, depth: int, ply: int):
+        killers = self.killers[ply]
+        if move != killers[0]:
+            killers[1], killers[0] = killers[0], move
+        index = move.from_square * 64 + move.to_square
+        self.history[index] += depth * depth
+        if self.history[index] > 500_000:
+            self.history = [value // 2 for value in self.history]
+
+    @staticmethod
+    def _score_to_tt(score: int, ply: int) -> int:
+        if score >= MATE - MAX_PLY:
+            return score + ply
+        if score <= -MATE + MAX_PLY:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _score_from_tt(score: int, ply: int) -> int:
+        if score >= MATE - MAX_PLY:
+            return score - ply
+        if score <= -MATE + MAX_PLY:
+            return score + ply
+        return score
+
+    def _principal_variation(self, board: Board, key: int, depth: int) -> List[Move]:
+        pv = []
+        board = board.copy(stack=False)
+        seen = set()
+        while len(pv) < depth and key not in seen:
+            seen.add(key)
+            entry = self.tt.get(key)
+            if entry is None or entry[4] is None or not board.is_legal(entry[4]):
+                break
+            pv.append(entry[4])
+            key = zobrist.push(board, entry[4], key)
+        return pv
@@ -0,0 +1,22 @@
+from typing import Set
+
+import chess
+from chess import Board, Move
+
+
+def changed_squares(board: Board, move: Move) -> Set[int]:
+    """
+    Squares whose contents change when ``move`` is pushed on ``board``.
+
+    Must be called before the move is pushed: castling and en passant are
+    detected from the position the move is played in.
+    """
+    squares = {move.from_square, move.to_square}
+    rank = chess.square_rank(move.from_square)
+    if board.is_kingside_castling(move):
+        squares.update((chess.square(7, rank), chess.square(5, rank)))
+    elif board.is_queenside_castling(move):
+        squares.update((chess.square(0, rank), chess.square(3, rank)))
+    elif board.is_en_passant(move):
+        squares.add(chess.square(chess.square_file(move.to_square), rank))
+    return squares
@@ -0,0 +1,48 @@
+import json
+import os
+from typing import Iterable, List, Tuple
+
+
+class ChromeTraceWriter:
+    """
+    Streams timed calls to a file in the Chrome Trace Event format (a JSON array of complete
+    ``"X"`` events), which Perfetto (ui.perfetto.dev) and chrome://tracing show as a flame
+    chart: nested calls are stacked under their parent on the track (thread or asyncio task)
+    they ran on.
+
+    Events are appended as they are written, one per line, so the file never has to be held
+    in memory. ``close`` ends the array; both viewers also load a file cut short by a crash.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.pid = os.getpid()
+        self.events = 0
+        self._track_names: List[str] = []
+        self._file = open(path, "w", encoding="utf-8")
+        self._file.write("[\n")
+
+    def _write(self, event: dict):
+        self._file.write(("," if self.events else "") + json.dumps(event, separators=(",", ":")) + "\n")
+        self.events += 1
+
+    def write(self, spans: Iterable[Tuple[int, str, int, int, int, int]], track_names: List[str]):
+        """
+        Append ``(index, name, start_ns, duration_ns, self_ns, track)`` spans, as yielded by
+        ``TimingRecorder.events_between``. ``track_names`` names the tracks by id.
+        """
+        # Track ids of finished tasks are reused, so a track is renamed whenever its name changes.
+        for track, name in enumerate(track_names):
+            if track >= len(self._track_names) or self._track_names[track] != name:
+                self._write({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": track, "args": {"name": name}})
+        self._track_names = list(track_names)
+
+        for _, name, start, duration, self_duration, track in spans:
+            self._write({"name": name, "cat": "timeit", "ph": "X", "pid": self.pid, "tid": track,
+                         "ts": start / 1000, "dur": duration / 1000, "args": {"self_us": self_duration / 1000}})
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.write("]\n")
+            self._file.close()
@@ -1,11 +0,0 @@
-from enum import Enum
-
-
-class Color(Enum):
-    LIGHT_GRAY = "#a9a9a9"
-    DARK_GRAY = "#696969"
-    GREEN = "#00ff00"
-    BLUE = "#0000ff"
-    RED = "#ff0000"
-    WHITE = "#ffffff"
-    BLACK = "#000000"
\ No newline at end of file
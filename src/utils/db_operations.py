@@ -1,76 +1,218 @@
 import time
-from typing import Optional
-from sqlalchemy import func, select
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import Connection, Table, func, insert, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 from collections import defaultdict
 from .models import (
     ExecutionTime, ExecutionSession, ExecutionOrder, 
-    TimelineEvent, GitTracking, get_sync_engine, get_async_engine
+    TimelineEvent, GitTracking, FunctionStats, FunctionHistogram, get_sync_engine, get_async_engine
 )
+from .histogram import LatencyHistogram
 
-async def save_execution_session(
-    session: AsyncSession,
-    execution_session_id: str,
-    execution_times: dict,
-    execution_order: list,
-    timeline_events: list,
-    git_commit: Optional[str] = None
-):
-    # Create new session
-    new_session = ExecutionSession(
-        session_id=execution_session_id,
-        timestamp=time.time()
-    )
-    session.add(new_session)
-    
-    # Add execution times
-    for func_name, times in execution_times.items():
-        for exec_time in times:
-            session.add(ExecutionTime(
-                session_id=execution_session_id,
-                function_name=func_name,
-                execution_time=exec_time
-            ))
-    
-    # Add execution order
-    for idx, (func_name, exec_time) in enumerate(execution_order):
-        session.add(ExecutionOrder(
-            session_id=execution_session_id,
-            order_index=idx,
-            function_name=func_name,
-            execution_time=exec_time
-        ))
-    
-    # Add timeline events
-    for func_name, start, end in timeline_events:
-        session.add(TimelineEvent(
-            session_id=execution_session_id,
-            function_name=func_name,
-            start_time=start,
-            end_time=end
-        ))
-    
-    # Add Git tracking if available
-    if git_commit:
-        session.add(GitTracking(
+def _bulk_insert(conn: Connection, table: Table, columns: Sequence[str], rows: List[tuple]):
+    """
+    Insert ``rows`` (tuples in ``columns`` order) into ``table`` with a single driver-level
+    executemany. The statement is compiled from a Core ``insert()`` once; binding the rows
+    as plain tuples skips SQLAlchemy's per-row parameter processing, which costs more than
+    the inserts themselves for large sessions.
+    """
+    if not rows:
+        return
+    compiled = insert(table).compile(dialect=conn.dialect, column_keys=list(columns))
+    if list(compiled.positiontup) != list(columns):
+        raise ValueError(f"Insert into {table.name} binds {compiled.positiontup}, not {list(columns)}")
+    conn.exec_driver_sql(str(compiled), rows)
+
+
+def save_execution_session(conn: Connection, execution_session_id: str):
+    """Create the row of the session, if this is its first save."""
+    exists = conn.execute(
+        select(ExecutionSession.session_id).where(ExecutionSession.session_id == execution_session_id)
+    ).first()
+    if exists is None:
+        conn.execute(insert(ExecutionSession.__table__).values(
             session_id=execution_session_id,
-            git_commit=git_commit,
             timestamp=time.time()
         ))
 
+
+def save_execution_events(conn: Connection, execution_session_id: str, events: List[tuple]):
+    """
+    Save a batch of timed calls, given as ``(order_index, function_name, start, end, self_time)``
+    with wall-clock times in seconds, with one bulk insert per table.
+    """
+    _bulk_insert(conn, ExecutionTime.__table__, ("session_id", "function_name", "execution_time"), [
+        (execution_session_id, func_name, end - start) for _, func_name, start, end, _ in events
+    ])
+    _bulk_insert(conn, ExecutionOrder.__table__, ("session_id", "order_index", "function_name", "execution_time"), [
+        (execution_session_id, idx, func_name, end - start) for idx, func_name, start, end, _ in events
+    ])
+    _bulk_insert(conn, TimelineEvent.__table__, ("session_id", "function_name", "start_time", "end_time"), [
+        (execution_session_id, func_name, start, end) for _, func_name, start, end, _ in events
+    ])
+    _update_function_stats(conn, execution_session_id, events)
+
+
+def _update_function_stats(conn: Connection, execution_session_id: str, events: List[tuple]):
+    """Merge the calls of a batch into the ``function_stats`` rows of the session."""
+    stats = {}
+    for _, func_name, start, end, self_time in events:
+        duration = end - start
+        entry = stats.get(func_name)
+        if entry is None:
+            stats[func_name] = [1, duration, duration, duration, duration * duration, self_time]
+        else:
+            entry[0] += 1
+            entry[1] = min(entry[1], duration)
+            entry[2] = max(entry[2], duration)
+            entry[3] += duration
+            entry[4] += duration * duration
+            entry[5] += self_time
+    if not stats:
+        return
+
+    table = FunctionStats.__table__
+    statement = sqlite_insert(table)
+    excluded = statement.excluded
+    conn.execute(
+        statement.on_conflict_do_update(
+            index_elements=[table.c.session_id, table.c.function_name],
+            set_={
+                "call_count": table.c.call_count + excluded.call_count,
+                "min_time": func.min(table.c.min_time, excluded.min_time),
+                "max_time": func.max(table.c.max_time, excluded.max_time),
+                "total_time": table.c.total_time + excluded.total_time,
+                "total_time_sq": table.c.total_time_sq + excluded.total_time_sq,
+                "self_time": table.c.self_time + excluded.self_time,
+            },
+        ),
+        [
+            {"session_id": execution_session_id, "function_name": func_name, "call_count": count,
+             "min_time": low, "max_time": high, "total_time": total, "total_time_sq": total_sq,
+             "self_time": self_time}
+            for func_name, (count, low, high, total, total_sq, self_time) in stats.items()
+        ],
+    )
+
+
+def save_function_histograms(conn: Connection, execution_session_id: str, histograms: Dict[str, bytes]):
+    """Replace the stored histograms of the session with ``histograms`` (name -> compact bytes)."""
+    if not histograms:
+        return
+    table = FunctionHistogram.__table__
+    statement = sqlite_insert(table)
+    conn.execute(
+        statement.on_conflict_do_update(
+            index_elements=[table.c.session_id, table.c.function_name],
+            set_={"counts": statement.excluded.counts},
+        ),
+        [
+            {"session_id": execution_session_id, "function_name": name, "counts": counts}
+            for name, counts in histograms.items()
+        ],
+    )
+
+
+def get_function_histograms(session: Session, session_id: Optional[str] = None) -> Dict[str, LatencyHistogram]:
+    """Latency histograms of every function of ``session_id``, or of the latest session."""
+    if session_id is None:
+        session_id = session.execute(
+            select(ExecutionSession.session_id).order_by(ExecutionSession.timestamp.desc()).limit(1)
+        ).scalar_one_or_none()
+    rows = session.execute(
+        select(FunctionHistogram.function_name, FunctionHistogram.counts)
+        .where(FunctionHistogram.session_id == session_id)
+    )
+    return {name: LatencyHistogram.from_bytes(counts) for name, counts in rows}
+
+
+def get_function_percentiles(session: Session) -> Dict[tuple, tuple]:
+    """``(p50, p95, p99, max)`` in seconds for every stored (session_id, function_name)."""
+    percentiles = {}
+    for session_id, name, counts in session.execute(
+            select(FunctionHistogram.session_id, FunctionHistogram.function_name, FunctionHistogram.counts)):
+        histogram = LatencyHistogram.from_bytes(counts)
+        percentiles[session_id, name] = tuple(
+            value / 1e9 for value in (*(histogram.percentile(p) for p in (50, 95, 99)), histogram.max)
+        )
+    return percentiles
+
+
+def get_session_ids(session: Session) -> List[str]:
+    """Every session id, oldest first (session N of the reports is ``get_session_ids(...)[N - 1]``)."""
+    return list(session.execute(
+        select(ExecutionSession.session_id).order_by(ExecutionSession.timestamp)
+    ).scalars())
+
+
+def get_commit_session_ids(session: Session, commit_prefix: str) -> List[str]:
+    """
+    Ids of the sessions run on the commit whose hash starts with ``commit_prefix``: on that
+    commit itself, or on a dirty tree on top of it, and also the sessions whose snapshot
+    commit is the one named.
+    """
+    return list(session.execute(
+        select(GitTracking.session_id).where(or_(
+            GitTracking.head_commit.startswith(commit_prefix),
+            GitTracking.git_commit.startswith(commit_prefix),
+        ))
+    ).scalars())
+
+
+def get_merged_histograms(session: Session, session_ids: Sequence[str]) -> Dict[str, LatencyHistogram]:
+    """
+    Latency histogram of every function over all of ``session_ids``. Sessions saved before the
+    histograms existed are bucketed from their raw execution times.
+    """
+    merged: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+    with_histograms = set()
+    for session_id, name, counts in session.execute(
+            select(FunctionHistogram.session_id, FunctionHistogram.function_name, FunctionHistogram.counts)
+            .where(FunctionHistogram.session_id.in_(session_ids))):
+        with_histograms.add(session_id)
+        merged[name].merge(LatencyHistogram.from_bytes(counts))
+
+    legacy = [session_id for session_id in session_ids if session_id not in with_histograms]
+    if legacy:
+        for name, seconds in session.execute(
+                select(ExecutionTime.function_name, ExecutionTime.execution_time)
+                .where(ExecutionTime.session_id.in_(legacy))):
+            merged[name].record(int(seconds * 1e9))
+    return dict(merged)
+
+
+def save_git_commit(conn: Connection, execution_session_id: str, git_commit: str, head_commit: Optional[str] = None):
+    """Record the commit the session ran and the HEAD it was made on (see ``GitSnapshot``)."""
+    table = GitTracking.__table__
+    statement = sqlite_insert(table).values(
+        session_id=execution_session_id,
+        git_commit=git_commit,
+        head_commit=head_commit,
+        timestamp=time.time()
+    )
+    conn.execute(statement.on_conflict_do_update(
+        index_elements=[table.c.session_id],
+        set_={"git_commit": statement.excluded.git_commit, "head_commit": statement.excluded.head_commit},
+    ))
+
 def get_execution_stats(session: Session):
+    """
+    Per-session, per-function call count and min/avg/max time, read from the ``function_stats``
+    summary so the report does not scan the raw execution times.
+    """
     query = (
         select(
-            ExecutionTime.function_name,
-            func.count().label('execution_count'),
-            func.min(ExecutionTime.execution_time).label('min_time'),
-            func.avg(ExecutionTime.execution_time).label('avg_time'),
-            func.max(ExecutionTime.execution_time).label('max_time'),
-            ExecutionTime.session_id  # Add session_id to the query
+            FunctionStats.function_name,
+            FunctionStats.call_count.label('execution_count'),
+            FunctionStats.min_time,
+            (FunctionStats.total_time / FunctionStats.call_count).label('avg_time'),
+            FunctionStats.max_time,
+            FunctionStats.session_id,
+            (FunctionStats.self_time / FunctionStats.call_count).label('avg_self_time'),
         )
         .join(ExecutionSession)
-        .group_by(ExecutionTime.session_id, ExecutionTime.function_name)
         .order_by(ExecutionSession.timestamp)  # Order by timestamp to maintain chronological order
     )
     
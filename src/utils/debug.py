@@ -2,16 +2,41 @@ import time
 import asyncio
 import functools
 import atexit
+import multiprocessing
 import signal
 import sys
+import os
 import uuid
-import subprocess
-from collections import defaultdict
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
-from sqlalchemy import select
-from .models import get_async_engine, init_db, ExecutionSession
-from .visualization import show_execution_visuals
-from .db_operations import save_execution_session
+from contextvars import ContextVar
+from typing import Optional
+from .recorder import DEFAULT_CAPACITY, TimingRecorder, measure_overhead
+from .git_snapshot import GitSnapshot, Snapshot
+from .telemetry import TelemetryWriter
+
+# CHESS_PROFILE=0 turns @timeit into a no-op: functions are returned undecorated and no
+# tracker, exit handlers or database code are ever loaded. CHESS_PROFILE_SAMPLE=N records
+# only one call in N of each function.
+PROFILE_ENABLED = os.environ.get("CHESS_PROFILE", "1").strip().lower() not in ("0", "false", "off", "no")
+SAMPLE_EVERY = max(int(os.environ.get("CHESS_PROFILE_SAMPLE", "1")), 1)
+
+# Innermost timed call running in the current context, as [nanoseconds spent in timed calls
+# nested in it, track, asyncio task of the track]. Context variables follow both nested calls
+# and asyncio tasks (which start with a copy of the context of their creator), so every call
+# knows its parent.
+_current_span: ContextVar[Optional[list]] = ContextVar("timeit_span", default=None)
+
+
+def _async_span(parent: Optional[list], recorder: TimingRecorder) -> list:
+    """
+    Span of a coroutine call. It stays on the track of its parent while it runs in the same
+    task; a call in another task (e.g. under ``asyncio.gather``) gets the track of its own
+    task, so concurrent calls are not drawn on top of each other. Sync calls always stay on
+    the track of their parent, checking the task on every call would double their overhead.
+    """
+    task = asyncio.current_task()
+    if parent is not None and parent[2] is task:
+        return [0, parent[1], task]
+    return [0, recorder.task_track(task) if task is not None else recorder.thread_track(), task]
 
 
 class ExecutionTracker:
@@ -24,51 +49,33 @@ class ExecutionTracker:
         return cls._instance
 
     def _initialize(self):
-        self.execution_times = defaultdict(list)
-        self.execution_order = []
-        self.timeline_events = []
+        self.recorder = TimingRecorder(int(os.environ.get("CHESS_TIMING_CAPACITY", DEFAULT_CAPACITY)))
+        self.sample_every = SAMPLE_EVERY
         self._execution_data_shown = False
         self.execution_session_id = str(uuid.uuid4())
+        trace_path = os.environ.get("CHESS_TRACE") or None
+        self.writer = TelemetryWriter(self.recorder, self.execution_session_id, trace_path=trace_path)
+        self.git_snapshot = GitSnapshot(self.execution_session_id, exclude=[trace_path] if trace_path else ())
         self._setup_handlers()
-        self.git_performance_branch = "performance_tracking"
-        self._db_initialized = False  # New flag to track DB initialization
-
-    async def _ensure_db_initialized(self, db_uri="execution_data.db"):
-        if not self._db_initialized:
-            engine = get_async_engine(db_uri)
-            await init_db(engine)
-            await engine.dispose()
-            self._db_initialized = True
-
-    async def save_execution_data(self, db_uri="execution_data.db"):
-        await self._ensure_db_initialized(db_uri)
-        engine = get_async_engine(db_uri)
-        async_session = async_sessionmaker(engine, class_=AsyncSession)
-        
-        async with async_session() as session:
-            async with session.begin():
-                try:
-                    result = await session.execute(
-                        select(ExecutionSession)
-                        .where(ExecutionSession.session_id == self.execution_session_id)
-                    )
-                    existing_session = result.scalar_one_or_none()
-                    
-                    if existing_session is None:
-                        git_commit = self.get_git_info()
-                        await save_execution_session(
-                            session=session,
-                            execution_session_id=self.execution_session_id,
-                            execution_times=self.execution_times,
-                            execution_order=self.execution_order,
-                            timeline_events=self.timeline_events,
-                            git_commit=git_commit
-                        )
-                except Exception as e:
-                    print(f"Error saving execution data: {e}")
-                    raise
+
+    async def save_execution_data(self):
+        """Write the calls not flushed yet by the background writer and the Git commit of the session."""
+        try:
+            snapshot = self.get_git_info()
+            if snapshot is None:
+                self.writer.close()
+            else:
+                self.writer.close(git_commit=snapshot.commit, head_commit=snapshot.head)
+        except Exception as e:
+            print(f"Error saving execution data: {e}")
+            raise
 
     def _setup_handlers(self):
+        # Worker processes (e.g. the engine pool) import the app too; only the main process saves data.
+        if multiprocessing.current_process().name != "MainProcess":
+            return
+        self.writer.start()
+        self.git_snapshot.start()
         atexit.register(self._handle_exit)
         sys.excepthook = self._sync_handle_excepthook  # Changed to sync version
         
@@ -115,6 +122,7 @@ class ExecutionTracker:
         self._execution_data_shown = True  # Fix: use self. instead of local variable
 
         try:
+            self.report_overhead()
             self.fetch_last_session_data()
         except Exception as e:
             print(f"Error executing: {e}", file=sys.stderr)
@@ -122,6 +130,7 @@ class ExecutionTracker:
     # Move fetch_last_session_data outside of show_execution_times
     def fetch_last_session_data(self):
         try:
+            from .visualization import show_execution_visuals
             show_execution_visuals()
         except Exception as e:
             print(f"Error loading data: {e}", file=sys.stderr)
@@ -131,77 +140,139 @@ class ExecutionTracker:
         Decorador que mide el tiempo de ejecución de funciones y almacena los resultados.
         Compatible con funciones síncronas y asíncronas.
         """
+        return self._wrap(func, self.recorder, self.sample_every)
+
+    @staticmethod
+    def _wrap(func, recorder: TimingRecorder, every: int = 1):
+        func_id = recorder.intern(func.__name__)
+        record = recorder.record
+        clock = time.perf_counter_ns
+        current = _current_span
+
+        if every > 1:
+            return ExecutionTracker._wrap_sampled(func, func_id, recorder, clock, every)
+
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
-            start_time = time.time()
-            result = func(*args, **kwargs)
-            return mid_wrapper(result, start_time)
+            parent = current.get()
+            span = [0, parent[1], parent[2]] if parent is not None else [0, recorder.thread_track(), None]
+            token = current.set(span)
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end = clock()
+                current.reset(token)
+                if parent is not None:
+                    parent[0] += end - start
+                record(func_id, start, end, span[0], span[1])
 
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
-            start_time = time.time()
-            result = await func(*args, **kwargs)
-            return mid_wrapper(result, start_time)
-
-        def mid_wrapper(result, start_time):
-            end_time = time.time()
-            execution_time = end_time - start_time
-            self.execution_times[func.__name__].append(execution_time)
-            self.execution_order.append((func.__name__, execution_time))
-            self.timeline_events.append((func.__name__, start_time, end_time))
-            return result
+            parent = current.get()
+            span = _async_span(parent, recorder)
+            token = current.set(span)
+            start = clock()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                end = clock()
+                current.reset(token)
+                if parent is not None:
+                    parent[0] += end - start
+                record(func_id, start, end, span[0], span[1])
 
         return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
 
-    def get_git_info(self):
-        """Get current Git commit information"""
-        try:
-            # Get current branch
-            current_branch = subprocess.check_output(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                text=True
-            ).strip()
-            
-            # Create performance branch if it doesn't exist
-            subprocess.run(
-                ["git", "branch", "--no-track", self.git_performance_branch],
-                capture_output=True,
-                check=False
-            )
-            
-            # Stash changes, switch to performance branch, and apply changes
-            subprocess.run(["git", "stash"], capture_output=True)
-            subprocess.run(["git", "checkout", self.git_performance_branch], capture_output=True)
-            subprocess.run(["git", "stash", "apply"], capture_output=True)
-            
-            # Create commit with execution session ID
-            commit_message = f"Performance measurement session: {self.execution_session_id}"
-            subprocess.run(["git", "add", "."], capture_output=True)
-            subprocess.run(
-                ["git", "commit", "-m", commit_message],
-                capture_output=True,
-                text=True
-            )
-            
-            # Get commit hash
-            commit_hash = subprocess.check_output(
-                ["git", "rev-parse", "HEAD"],
-                text=True
-            ).strip()
-            
-            # Switch back to original branch
-            subprocess.run(["git", "checkout", current_branch], capture_output=True)
-            
-            return commit_hash
-        except Exception as e:
-            print(f"Error getting Git info: {e}", file=sys.stderr)
-            return None
+    @staticmethod
+    def _wrap_sampled(func, func_id, recorder: TimingRecorder, clock, every: int):
+        """
+        Like ``_wrap`` but only one of every ``every`` calls is timed. Calls that are not
+        timed are not spans either, so self times only discount the sampled children.
+        The countdown is kept per function id in the recorder, so it carries over between
+        wrappers of the same function (e.g. closures decorated again on every call).
+        """
+        record = recorder.record
+        current = _current_span
+        countdowns = recorder.countdowns
+
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            left = countdowns[func_id] - 1
+            if left > 0:
+                countdowns[func_id] = left
+                return func(*args, **kwargs)
+            countdowns[func_id] = every
+            parent = current.get()
+            span = [0, parent[1], parent[2]] if parent is not None else [0, recorder.thread_track(), None]
+            token = current.set(span)
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end = clock()
+                current.reset(token)
+                if parent is not None:
+                    parent[0] += end - start
+                record(func_id, start, end, span[0], span[1])
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            left = countdowns[func_id] - 1
+            if left > 0:
+                countdowns[func_id] = left
+                return await func(*args, **kwargs)
+            countdowns[func_id] = every
+            parent = current.get()
+            span = _async_span(parent, recorder)
+            token = current.set(span)
+            start = clock()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                end = clock()
+                current.reset(token)
+                if parent is not None:
+                    parent[0] += end - start
+                record(func_id, start, end, span[0], span[1])
+
+        return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
+
+    def measure_overhead(self) -> float:
+        """Nanoseconds the decorator adds to each call, measured on a scratch recorder."""
+        return measure_overhead(lambda func: self._wrap(func, TimingRecorder(1024), self.sample_every))
+
+    def report_overhead(self):
+        overhead = self.measure_overhead()
+        recorder = self.recorder
+        sampling = f", sampling 1 in {self.sample_every}" if self.sample_every > 1 else ""
+        print(f"timeit: {recorder.total} calls recorded ({self.writer.flushed} saved, {self.writer.lost} lost{sampling}), "
+              f"~{overhead:.0f} ns per call, ~{overhead * recorder.total * self.sample_every / 1e6:.1f} ms in total")
+
+    def get_git_info(self) -> Optional[Snapshot]:
+        """Commit of the code this session ran and its HEAD (see ``GitSnapshot``), or None outside a Git repository."""
+        return self.git_snapshot.result()
+
+_tracker: Optional[ExecutionTracker] = None
+
+
+def get_tracker() -> ExecutionTracker:
+    """The tracker of this process, created (with its exit handlers) on first use."""
+    global _tracker
+    if _tracker is None:
+        _tracker = ExecutionTracker()
+    return _tracker
 
-_tracker = ExecutionTracker()
+def current_tracker() -> Optional[ExecutionTracker]:
+    """The tracker of this process if profiling is on and something was instrumented, else None."""
+    return _tracker
 
 # Alias para mayor comodidad
 def timeit(func):
-    return _tracker.timing_decorator(func)
+    if not PROFILE_ENABLED:
+        return func
+    return get_tracker().timing_decorator(func)
 
 def show_execution_times():
-    _tracker.show_execution_times()
\ No newline at end of file
+    if _tracker is not None:
+        _tracker.show_execution_times()
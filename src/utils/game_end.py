@@ -0,0 +1,96 @@
+from collections import Counter
+from typing import List, Optional
+
+import chess
+from chess import Board, Move, Outcome, Termination
+from chess.polyglot import zobrist_hash
+
+from . import zobrist
+
+
+class RepetitionTracker:
+    """
+    Counts how often each position of a line has occurred up to a ply.
+
+    The Zobrist key of every position of the line is kept, computed incrementally as moves
+    are pushed, together with a counter of the keys from the start up to ``ply``. Pushing a
+    move or moving the cursor one ply updates the counter in constant time, so the number of
+    repetitions of the current position never requires replaying the move stack.
+    """
+
+    def __init__(self, board: Board):
+        self.keys: List[int] = []
+        self.counts: Counter = Counter()
+        self.ply = 0
+        self.reset(board)
+
+    def reset(self, board: Board):
+        self.keys = [zobrist_hash(board)]
+        self.counts = Counter(self.keys)
+        self.ply = 0
+
+    def push(self, board: Board, move: Move):
+        """Push ``move`` on ``board`` at the cursor, dropping the keys of the line after it."""
+        key = zobrist.push(board, move, self.keys[self.ply])
+        del self.keys[self.ply + 1:]
+        self.keys.append(key)
+        self.ply += 1
+        self.counts[key] += 1
+
+    def seek(self, ply: int):
+        """Move the cursor to ``ply``, which must be within the keys already pushed."""
+        while self.ply < ply:
+            self.ply += 1
+            self.counts[self.keys[self.ply]] += 1
+        while self.ply > ply:
+            self.counts[self.keys[self.ply]] -= 1
+            self.ply -= 1
+
+    @property
+    def key(self) -> int:
+        return self.keys[self.ply]
+
+    def count(self) -> int:
+        """Number of times the position at the cursor has occurred, counting itself."""
+        return self.counts[self.key]
+
+
+def outcome(board: Board, repetitions: RepetitionTracker) -> Optional[Outcome]:
+    """
+    Result of the game at ``board``, or None if it goes on. Unlike ``Board.outcome`` this
+    also ends the game on the claimable draws (threefold repetition and the fifty-move rule),
+    and takes the repetition count from ``repetitions`` instead of replaying the move stack.
+    """
+    has_moves = any(board.generate_legal_moves())
+    if not has_moves:
+        if board.is_check():
+            return Outcome(Termination.CHECKMATE, not board.turn)
+        return Outcome(Termination.STALEMATE, None)
+    if board.is_insufficient_material():
+        return Outcome(Termination.INSUFFICIENT_MATERIAL, None)
+
+    count = repetitions.count()
+    if count >= 5:
+        return Outcome(Termination.FIVEFOLD_REPETITION, None)
+    if board.halfmove_clock >= 150:
+        return Outcome(Termination.SEVENTYFIVE_MOVES, None)
+    if count >= 3:
+        return Outcome(Termination.THREEFOLD_REPETITION, None)
+    if board.halfmove_clock >= 100:
+        return Outcome(Termination.FIFTY_MOVES, None)
+    return None
+
+
+def describe(result: Outcome) -> str:
+    """Human readable reason and result, e.g. ``"Checkmate! White wins (1-0)"``."""
+    if result.termination == Termination.CHECKMATE:
+        return f"Checkmate! {chess.COLOR_NAMES[result.winner].capitalize()} wins ({result.result()})"
+    reason = {
+        Termination.STALEMATE: "stalemate",
+        Termination.INSUFFICIENT_MATERIAL: "insufficient material",
+        Termination.FIVEFOLD_REPETITION: "fivefold repetition",
+        Termination.SEVENTYFIVE_MOVES: "the 75-move rule",
+        Termination.THREEFOLD_REPETITION: "threefold repetition",
+        Termination.FIFTY_MOVES: "the 50-move rule",
+    }.get(result.termination, result.termination.name.lower().replace("_", " "))
+    return f"Draw by {reason} ({result.result()})"
@@ -0,0 +1,95 @@
+from typing import List, Optional
+
+from chess import Board, Move
+
+from .game_end import RepetitionTracker
+
+
+class GameHistory:
+    """
+    Moves of the current game and a cursor (``ply``) into them.
+
+    A snapshot of the position (as FEN) is kept every ``interval`` plies, so any ply can be
+    reached by restoring the nearest earlier snapshot and replaying fewer than ``interval``
+    moves, however long the game is. Moves after the cursor are kept, so stepping back and
+    forward again is a redo, until a different move is played from an earlier ply.
+
+    ``sans`` is the SAN of every move in the line and backs the move table (``take_changed``
+    tells it which rows went stale), and ``repetitions`` counts the positions of the line up
+    to the cursor.
+    """
+
+    def __init__(self, board: Board, interval: int = 16):
+        self.interval = interval
+        self.moves: List[Move] = []
+        self.sans: List[str] = []
+        self.ply = 0
+        self._snapshots: List[str] = [board.fen()]
+        self.repetitions = RepetitionTracker(board)
+        # First ply of ``sans`` replaced or removed since the last ``take_changed``.
+        self._changed_from: Optional[int] = None
+
+    def reset(self, board: Board):
+        """Start a new, empty line from the current position of ``board``."""
+        self.moves.clear()
+        self.sans.clear()
+        self.ply = 0
+        self._snapshots = [board.fen()]
+        self.repetitions.reset(board)
+        self._changed_from = 0
+
+    def push(self, board: Board, move: Move) -> str:
+        """
+        Play ``move`` on ``board`` at the cursor and return its SAN. If it is the next move
+        of the line the rest of the line is kept, otherwise the line is cut at the cursor.
+        """
+        if self.ply < len(self.moves):
+            if self.moves[self.ply] == move:
+                board.push(move)
+                self.ply += 1
+                self.repetitions.seek(self.ply)
+                return self.sans[self.ply - 1]
+            self._truncate(self.ply)
+
+        self.sans.append(board.san(move))
+        self.repetitions.push(board, move)
+        self.moves.append(move)
+        self.ply += 1
+        if self.ply % self.interval == 0 and len(self._snapshots) == self.ply // self.interval:
+            self._snapshots.append(board.fen())
+        return self.sans[-1]
+
+    def _truncate(self, ply: int):
+        del self.moves[ply:]
+        del self.sans[ply:]
+        del self._snapshots[ply // self.interval + 1:]
+        self._changed_from = ply if self._changed_from is None else min(self._changed_from, ply)
+
+    def take_changed(self) -> Optional[int]:
+        """
+        First ply whose move was replaced or removed since the last call, or None if the line
+        was only extended. Branching keeps the length of ``sans``, so its length alone does not
+        show which entries are new.
+        """
+        changed, self._changed_from = self._changed_from, None
+        return changed
+
+    def seek(self, board: Board, ply: int):
+        """Set ``board`` to the position after ``ply`` moves of the line."""
+        ply = min(max(ply, 0), len(self.moves))
+        if ply < self.ply and self.ply - ply <= len(board.move_stack) and self.ply - ply < self.interval:
+            for _ in range(self.ply - ply):
+                board.pop()
+        elif ply < self.ply or ply - self.ply >= self.interval:
+            base = ply // self.interval
+            board.set_fen(self._snapshots[base])
+            for move in self.moves[base * self.interval:ply]:
+                board.push(move)
+        else:
+            for move in self.moves[self.ply:ply]:
+                board.push(move)
+        self.ply = ply
+        self.repetitions.seek(ply)
+
+    def last_move(self) -> Optional[Move]:
+        return self.moves[self.ply - 1] if self.ply else None
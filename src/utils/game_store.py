@@ -0,0 +1,162 @@
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import chess
+import chess.pgn
+from chess import Board
+from chess.polyglot import zobrist_hash
+from sqlalchemy import Engine, distinct, func, insert, select
+from sqlalchemy.orm import Session
+
+from . import zobrist
+from .models import GamePosition, GamesBase, StoredGame, get_sync_engine
+
+DEFAULT_GAMES_DB = "games.db"
+
+
+@dataclass
+class PositionSearch:
+    """Games that reached a position, with results counted once per game."""
+    total: int = 0
+    white_wins: int = 0
+    draws: int = 0
+    black_wins: int = 0
+    games: List[Tuple[StoredGame, int]] = field(default_factory=list)  # (game, first ply reaching the position)
+
+
+def get_games_engine(db_path: str = DEFAULT_GAMES_DB) -> Engine:
+    engine = get_sync_engine(db_path)
+    GamesBase.metadata.create_all(engine)
+    return engine
+
+
+def to_signed(key: int) -> int:
+    """Map an unsigned 64-bit Zobrist key onto SQLite's signed INTEGER range."""
+    return key - (1 << 64) if key >= 1 << 63 else key
+
+
+class _PositionKeyBuilder(chess.pgn.GameBuilder):
+    """
+    Builds the mainline of a game while collecting the Zobrist key of every position in it.
+    Keys are updated incrementally from the moves the parser plays, so the game is not
+    replayed a second time. Variations are skipped.
+    """
+
+    def begin_game(self):
+        super().begin_game()
+        self.keys: List[int] = []
+        self._delta: Optional[int] = None
+
+    def begin_variation(self):
+        return chess.pgn.SKIP
+
+    def end_variation(self):
+        # The reader still calls this for skipped variations; GameBuilder would pop a variation it never pushed.
+        pass
+
+    def visit_move(self, board: Board, move: chess.Move):
+        self._delta = zobrist.piece_delta(board, move) ^ zobrist.state_hash(board)
+        super().visit_move(board, move)
+
+    def visit_board(self, board: Board):
+        if self._delta is None:
+            self.keys.append(zobrist_hash(board))
+        else:
+            self.keys.append(self.keys[-1] ^ self._delta ^ zobrist.state_hash(board))
+            self._delta = None
+
+
+def import_pgn(engine: Engine, path: str, batch_size: int = 50_000) -> int:
+    """
+    Load every game of the PGN file at ``path`` into the store, with one row per position
+    reached. Rows are written with batched executemany inserts inside a single transaction.
+    Returns the number of games imported.
+    """
+    imported = 0
+    with engine.begin() as conn, open(path, encoding="utf-8-sig", errors="replace") as pgn:
+        next_id = (conn.execute(select(func.max(StoredGame.id))).scalar() or 0) + 1
+        games, positions = [], []
+
+        def flush():
+            if games:
+                conn.execute(insert(StoredGame), games)
+                games.clear()
+            if positions:
+                conn.execute(insert(GamePosition), positions)
+                positions.clear()
+
+        while True:
+            builder = _PositionKeyBuilder()
+            game = chess.pgn.read_game(pgn, Visitor=lambda: builder)
+            if game is None:
+                break
+            headers = game.headers
+            games.append({
+                "id": next_id,
+                "event": headers.get("Event"),
+                "date": headers.get("Date"),
+                "white": headers.get("White"),
+                "black": headers.get("Black"),
+                "result": headers.get("Result", "*"),
+                "fen": headers.get("FEN"),
+                "moves": " ".join(move.uci() for move in game.mainline_moves()),
+            })
+            positions.extend(
+                {"game_id": next_id, "ply": ply, "position_key": to_signed(key)}
+                for ply, key in enumerate(builder.keys)
+            )
+            next_id += 1
+            imported += 1
+            if len(positions) >= batch_size:
+                flush()
+        flush()
+    return imported
+
+
+def find_position(engine: Engine, board: Board, limit: int = 200) -> PositionSearch:
+    """Every stored game that reached the position on ``board``, with white/draw/black counts."""
+    key = to_signed(zobrist_hash(board))
+    search = PositionSearch()
+    with Session(engine) as session:
+        counts = session.execute(
+            select(StoredGame.result, func.count(distinct(GamePosition.game_id)))
+            .join(StoredGame, StoredGame.id == GamePosition.game_id)
+            .where(GamePosition.position_key == key)
+            .group_by(StoredGame.result)
+        )
+        for result, count in counts:
+            search.total += count
+            if result == "1-0":
+                search.white_wins += count
+            elif result == "0-1":
+                search.black_wins += count
+            elif result == "1/2-1/2":
+                search.draws += count
+
+        first_ply = (
+            select(GamePosition.game_id, func.min(GamePosition.ply).label("ply"))
+            .where(GamePosition.position_key == key)
+            .group_by(GamePosition.game_id)
+            .limit(limit)
+            .subquery()
+        )
+        search.games = [
+            (game, ply) for game, ply in
+            session.execute(select(StoredGame, first_ply.c.ply).join(first_ply, StoredGame.id == first_ply.c.game_id))
+        ]
+    return search
+
+
+def to_pgn_game(stored: StoredGame) -> chess.pgn.Game:
+    """Rebuild a ``chess.pgn.Game`` from a stored game."""
+    game = chess.pgn.Game()
+    if stored.fen:
+        game.setup(stored.fen)
+    node = game
+    for uci in (stored.moves or "").split():
+        node = node.add_variation(chess.Move.from_uci(uci))
+    for name, value in (("Event", stored.event), ("Date", stored.date), ("White", stored.white),
+                        ("Black", stored.black), ("Result", stored.result)):
+        if value:
+            game.headers[name] = value
+    return game
@@ -0,0 +1,110 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from typing import List, NamedTuple, Optional, Sequence
+
+REF_PREFIX = "refs/performance/"
+# Snapshots are machine-made, so they get their own identity instead of requiring the user's.
+SNAPSHOT_IDENTITY = {
+    "GIT_AUTHOR_NAME": "Performance tracking", "GIT_AUTHOR_EMAIL": "performance@localhost",
+    "GIT_COMMITTER_NAME": "Performance tracking", "GIT_COMMITTER_EMAIL": "performance@localhost",
+}
+# Files the app writes while it runs (databases and their journals, PGN indexes, benchmark
+# baselines, the opening book). They are data rather than code, and the databases can be large.
+RUNTIME_FILES = (
+    "execution_data.db*", "games.db*", "*.idx", "*.idx.tmp", "ui_bench.json", "book.bin",
+)
+
+
+class Snapshot(NamedTuple):
+    head: str
+    # The code the session ran: ``head`` itself for a clean tree, else the snapshot commit.
+    commit: str
+
+
+class GitSnapshot:
+    """
+    Records the code a session ran: HEAD if the working tree is clean, otherwise a commit of the
+    dirty tree (parent HEAD) kept alive under ``REF_PREFIX + session_id``. ``RUNTIME_FILES``
+    and the ``exclude`` paths (e.g. the Chrome trace) are left out of the snapshot.
+
+    Everything goes through git plumbing with a temporary copy of the index (``add -A``,
+    ``write-tree``, ``commit-tree``, ``update-ref``), so the working tree, the real index and
+    the current branch are never touched. The snapshot is taken in a background thread as
+    soon as ``start`` is called, which is also when the code was loaded, so at exit
+    ``result`` usually returns immediately.
+    """
+
+    def __init__(self, session_id: str, cwd: Optional[str] = None, exclude: Sequence[str] = ()):
+        self.session_id = session_id
+        self.cwd = cwd or os.path.dirname(os.path.abspath(__file__))
+        self.exclude = [os.path.abspath(path) for path in exclude]
+        self._snapshot: Optional[Snapshot] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="git-snapshot", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        try:
+            self._snapshot = self.take()
+        except subprocess.CalledProcessError as e:
+            print(f"Error getting Git info: {e}\n{e.stderr}", file=sys.stderr)
+        except OSError as e:
+            print(f"Error getting Git info: {e}", file=sys.stderr)
+
+    def result(self, timeout: float = 10.0) -> Optional[Snapshot]:
+        """The snapshot, waiting up to ``timeout`` seconds for it. None if it could not be taken."""
+        if self._thread is None:
+            self.start()
+        self._thread.join(timeout)
+        return self._snapshot
+
+    def _git(self, *args: str, env: Optional[dict] = None) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=self.cwd, env=env, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    def _pathspecs(self, top: str) -> List[str]:
+        pathspecs = [":/"]
+        pathspecs += [f":(top,exclude,glob)**/{pattern}" for pattern in RUNTIME_FILES]
+        for path in self.exclude:
+            relative = os.path.relpath(path, top)
+            if not relative.startswith(os.pardir):
+                pathspecs.append(f":(top,exclude,literal){relative}")
+        return pathspecs
+
+    def take(self) -> Optional[Snapshot]:
+        """Take the snapshot now, in the calling thread. None outside a repository or before its first commit."""
+        env = dict(os.environ, GIT_OPTIONAL_LOCKS="0")
+        try:
+            lines: List[str] = self._git(
+                "rev-parse", "--show-toplevel", "HEAD", "HEAD^{tree}", "--git-path", "index", env=env
+            ).splitlines()
+        except subprocess.CalledProcessError:
+            return None
+        top, head, head_tree, index = lines
+        if not os.path.isabs(index):
+            index = os.path.join(self.cwd, index)
+
+        with tempfile.TemporaryDirectory(prefix="chess-snapshot-") as directory:
+            env["GIT_INDEX_FILE"] = os.path.join(directory, "index")
+            # Starting from a copy of the real index lets add reuse its stat data and only hash changed files.
+            if os.path.exists(index):
+                shutil.copyfile(index, env["GIT_INDEX_FILE"])
+            self._git("add", "-A", "--", *self._pathspecs(top), env=env)
+            tree = self._git("write-tree", env=env)
+
+        if tree == head_tree:
+            return Snapshot(head, head)
+        commit = self._git(
+            "commit-tree", tree, "-p", head, "-m", f"Performance measurement session: {self.session_id}",
+            env=dict(env, **SNAPSHOT_IDENTITY),
+        )
+        self._git("update-ref", REF_PREFIX + self.session_id, commit)
+        return Snapshot(head, commit)
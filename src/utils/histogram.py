@@ -0,0 +1,94 @@
+import zlib
+from array import array
+from typing import Optional
+
+# Log-linear buckets in the style of HdrHistogram: values below SUB_BUCKETS nanoseconds get a
+# bucket each, and every power of two above is split into SUB_BUCKETS equal buckets, so the
+# relative error of any value is below 1 / SUB_BUCKETS (6%). Values from MAX_VALUE up all go
+# to the last bucket.
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+MAX_EXPONENT = 40
+BUCKETS = (MAX_EXPONENT + 1) * SUB_BUCKETS
+MAX_VALUE = 1 << (MAX_EXPONENT + SUB_BUCKET_BITS)  # ~4.9 hours in nanoseconds
+
+
+def bucket_of(value: int) -> int:
+    if value < SUB_BUCKETS:
+        return max(value, 0)
+    exponent = value.bit_length() - SUB_BUCKET_BITS - 1
+    return min(((exponent + 1) << SUB_BUCKET_BITS) + (value >> exponent) - SUB_BUCKETS, BUCKETS - 1)
+
+
+def bucket_range(bucket: int) -> tuple:
+    """Lowest and highest value (inclusive) that fall into ``bucket``."""
+    if bucket < SUB_BUCKETS:
+        return bucket, bucket
+    exponent = (bucket >> SUB_BUCKET_BITS) - 1
+    lowest = ((bucket & (SUB_BUCKETS - 1)) + SUB_BUCKETS) << exponent
+    return lowest, lowest + (1 << exponent) - 1
+
+
+def format_ns(value: int) -> str:
+    if value >= 1_000_000_000:
+        return f"{value / 1e9:.2f} s"
+    if value >= 1_000_000:
+        return f"{value / 1e6:.2f} ms"
+    if value >= 1_000:
+        return f"{value / 1e3:.1f} us"
+    return f"{value} ns"
+
+
+class LatencyHistogram:
+    """
+    Fixed-size histogram of durations in nanoseconds (``BUCKETS`` counters, ~5 KiB).
+
+    Percentiles are answered from the bucket counts, as the highest value of the bucket the
+    percentile falls into, so they can be computed without the raw samples.
+    """
+
+    def __init__(self, counts: Optional[array] = None):
+        self.counts = counts if counts is not None else array("Q", bytes(8 * BUCKETS))
+
+    def record(self, value: int):
+        self.counts[bucket_of(value)] += 1
+
+    def merge(self, other: "LatencyHistogram"):
+        counts = self.counts
+        for bucket, count in enumerate(other.counts):
+            if count:
+                counts[bucket] += count
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts)
+
+    def percentile(self, percent: float) -> int:
+        """Value in nanoseconds below which ``percent`` % of the recorded durations fall."""
+        total = self.total
+        if not total:
+            return 0
+        target = max(int(total * percent / 100 + 0.5), 1)
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return bucket_range(bucket)[1]
+        return bucket_range(BUCKETS - 1)[1]
+
+    @property
+    def max(self) -> int:
+        for bucket in range(BUCKETS - 1, -1, -1):
+            if self.counts[bucket]:
+                return bucket_range(bucket)[1]
+        return 0
+
+    def to_bytes(self) -> bytes:
+        """Compact form for storage: the counters, zlib-compressed (mostly zeros, so a few hundred bytes)."""
+        return zlib.compress(self.counts.tobytes())
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "LatencyHistogram":
+        counts = array("Q")
+        counts.frombytes(zlib.decompress(data))
+        return cls(counts)
@@ -0,0 +1,71 @@
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+from .recorder import TimingRecorder
+
+
+class LiveStats:
+    """
+    Incremental per-function statistics over the calls of a ``TimingRecorder``, for a live view.
+
+    Each ``update`` only reads the calls recorded since the previous one, and at most
+    ``max_events`` of them (the newest; older ones are counted as skipped), so its cost is
+    bounded however busy the app is. Percentiles come from the last ``window`` durations of
+    each function, and ``activity`` keeps the number of calls per update for the last
+    ``history`` updates.
+    """
+
+    def __init__(self, recorder: TimingRecorder, window: int = 512, history: int = 60, max_events: int = 20_000):
+        self.recorder = recorder
+        self.window = window
+        self.history = history
+        self.max_events = max_events
+        self.calls: Dict[str, int] = {}
+        self.durations: Dict[str, Deque[int]] = {}
+        self.activity: Dict[str, Deque[int]] = {}
+        self.total_activity: Deque[int] = deque(maxlen=history)
+        self.skipped = 0
+        self._seen = recorder.oldest
+
+    def update(self) -> int:
+        """Read the calls recorded since the last update. Returns how many were read."""
+        recorder = self.recorder
+        stop = recorder.total
+        first = max(self._seen, recorder.oldest, stop - self.max_events)
+        self.skipped += first - self._seen
+        self._seen = stop
+
+        counts: Dict[str, int] = {}
+        for _, name, _, duration, _, _ in recorder.events_between(first, stop):
+            counts[name] = counts.get(name, 0) + 1
+            window = self.durations.get(name)
+            if window is None:
+                window = self.durations[name] = deque(maxlen=self.window)
+                self.activity[name] = deque(maxlen=self.history)
+            window.append(duration)
+
+        for name, activity in self.activity.items():
+            count = counts.get(name, 0)
+            activity.append(count)
+            self.calls[name] = self.calls.get(name, 0) + count
+        self.total_activity.append(stop - first)
+        return stop - first
+
+    def percentiles(self, name: str) -> Tuple[int, int, int, int]:
+        """``(p50, p95, p99, max)`` in nanoseconds over the recent calls of ``name``."""
+        ordered = sorted(self.durations[name])
+        last = len(ordered) - 1
+        return tuple(ordered[int(last * percent / 100 + 0.5)] for percent in (50, 95, 99)) + (ordered[last],)
+
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+def sparkline(values) -> str:
+    """Text sparkline of ``values``, scaled to their maximum."""
+    values = list(values)
+    top = max(values, default=0)
+    if not top:
+        return SPARK_CHARS[0] * len(values)
+    steps = len(SPARK_CHARS) - 1
+    return "".join(SPARK_CHARS[(value * steps + top - 1) // top] for value in values)
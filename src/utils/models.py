@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, Integer, ForeignKey, create_engine
+from sqlalchemy import Column, String, Float, Integer, BigInteger, LargeBinary, Text, ForeignKey, Index, create_engine, event, func, insert, inspect, select
 from sqlalchemy.orm import declarative_base, relationship
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
@@ -15,9 +15,16 @@ class ExecutionSession(Base):
     execution_orders = relationship("ExecutionOrder", back_populates="session", cascade="all, delete-orphan")
     timeline_events = relationship("TimelineEvent", back_populates="session", cascade="all, delete-orphan")
     git_tracking = relationship("GitTracking", back_populates="session", uselist=False, cascade="all, delete-orphan")
+    function_stats = relationship("FunctionStats", back_populates="session", cascade="all, delete-orphan")
+    function_histograms = relationship("FunctionHistogram", back_populates="session", cascade="all, delete-orphan")
 
 class ExecutionTime(Base):
     __tablename__ = 'execution_times'
+    # One composite index per table serves both per-session and per-function lookups within a
+    # session; separate indexes would double the cost of every bulk insert.
+    __table_args__ = (
+        Index('ix_execution_times_session_function', 'session_id', 'function_name'),
+    )
     
     id = Column(Integer, primary_key=True)
     session_id = Column(String, ForeignKey('execution_sessions.session_id', ondelete='CASCADE'))
@@ -38,6 +45,9 @@ class ExecutionOrder(Base):
 
 class TimelineEvent(Base):
     __tablename__ = 'timeline_events'
+    __table_args__ = (
+        Index('ix_timeline_events_session_function', 'session_id', 'function_name'),
+    )
     
     id = Column(Integer, primary_key=True)
     session_id = Column(String, ForeignKey('execution_sessions.session_id', ondelete='CASCADE'))
@@ -51,18 +61,130 @@ class GitTracking(Base):
     __tablename__ = 'git_tracking'
     
     session_id = Column(String, ForeignKey('execution_sessions.session_id', ondelete='CASCADE'), primary_key=True)
+    # The code the session ran: HEAD, or a snapshot commit of the dirty tree whose parent is HEAD.
     git_commit = Column(String)
+    head_commit = Column(String)
     timestamp = Column(Float)
     
     session = relationship("ExecutionSession", back_populates="git_tracking")
 
+class FunctionStats(Base):
+    """Per-session summary of the calls of a function, kept up to date as calls are saved."""
+    __tablename__ = 'function_stats'
+
+    session_id = Column(String, ForeignKey('execution_sessions.session_id', ondelete='CASCADE'), primary_key=True)
+    function_name = Column(String, primary_key=True)
+    call_count = Column(Integer, nullable=False)
+    min_time = Column(Float, nullable=False)
+    max_time = Column(Float, nullable=False)
+    total_time = Column(Float, nullable=False)
+    total_time_sq = Column(Float, nullable=False)  # Sum of squares, for the standard deviation
+    self_time = Column(Float)  # Total minus the time in timed calls nested in them; NULL for older sessions
+
+    session = relationship("ExecutionSession", back_populates="function_stats")
+
+class FunctionHistogram(Base):
+    """Latency histogram of a function over a session, as ``LatencyHistogram.to_bytes``."""
+    __tablename__ = 'function_histograms'
+
+    session_id = Column(String, ForeignKey('execution_sessions.session_id', ondelete='CASCADE'), primary_key=True)
+    function_name = Column(String, primary_key=True)
+    counts = Column(LargeBinary, nullable=False)
+
+    session = relationship("ExecutionSession", back_populates="function_histograms")
+
+# Games store (separate database from the execution data)
+GamesBase = declarative_base()
+
+class StoredGame(GamesBase):
+    __tablename__ = 'games'
+
+    id = Column(Integer, primary_key=True)
+    event = Column(String)
+    date = Column(String)
+    white = Column(String)
+    black = Column(String)
+    result = Column(String, index=True)
+    fen = Column(String)  # Starting position, only set for games that don't start from the initial one
+    moves = Column(Text)  # Mainline in UCI, space separated
+
+class GamePosition(GamesBase):
+    __tablename__ = 'game_positions'
+    __table_args__ = (
+        Index('ix_game_positions_key', 'position_key', 'game_id', 'ply'),
+        {'sqlite_with_rowid': False},
+    )
+
+    game_id = Column(Integer, ForeignKey('games.id', ondelete='CASCADE'), primary_key=True)
+    ply = Column(Integer, primary_key=True)
+    position_key = Column(BigInteger, nullable=False)  # Polyglot Zobrist key stored as signed 64-bit
+
 # Database configuration
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",  # 16 MB
+)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
 def get_sync_engine(db_path):
-    return create_engine(f"sqlite:///{db_path}")
+    engine = create_engine(f"sqlite:///{db_path}")
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
 
 def get_async_engine(db_path):
-    return create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+def _backfill_function_stats(conn):
+    """Summarize the raw execution times of databases created before ``function_stats`` existed."""
+    conn.execute(insert(FunctionStats.__table__).from_select(
+        ['session_id', 'function_name', 'call_count', 'min_time', 'max_time', 'total_time', 'total_time_sq'],
+        select(
+            ExecutionTime.session_id,
+            ExecutionTime.function_name,
+            func.count(),
+            func.min(ExecutionTime.execution_time),
+            func.max(ExecutionTime.execution_time),
+            func.sum(ExecutionTime.execution_time),
+            func.sum(ExecutionTime.execution_time * ExecutionTime.execution_time),
+        ).group_by(ExecutionTime.session_id, ExecutionTime.function_name)
+    ))
+
+def _add_missing_columns(conn):
+    """create_all does not alter existing tables; add the (nullable) columns added since they were created."""
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                conn.exec_driver_sql(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(conn.dialect)}"
+                )
+
+def _create_schema(conn):
+    needs_backfill = inspect(conn).has_table(ExecutionTime.__tablename__) and \
+        not inspect(conn).has_table(FunctionStats.__tablename__)
+    Base.metadata.create_all(conn)
+    _add_missing_columns(conn)
+    if needs_backfill:
+        _backfill_function_stats(conn)
+    # create_all only adds the indexes of tables it creates; add new ones to existing databases.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+def init_sync_db(engine):
+    with engine.begin() as conn:
+        _create_schema(conn)
 
 async def init_db(engine):
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(_create_schema)
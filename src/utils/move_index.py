@@ -0,0 +1,43 @@
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from chess import Board, Move
+from chess.polyglot import zobrist_hash
+
+
+class MoveIndex:
+    """
+    Per-position index of the legal moves of a board, grouped by origin square.
+
+    The index maps each from-square to its target squares, and each target square
+    to the moves that reach it (more than one for promotions). It is built the first
+    time it is queried for a position and reused while the position hash is unchanged.
+    """
+
+    def __init__(self, board: Board):
+        self.board = board
+        self._key: Optional[int] = None
+        self._index: Dict[int, Dict[int, List[Move]]] = {}
+
+    def _ensure(self) -> Dict[int, Dict[int, List[Move]]]:
+        key = zobrist_hash(self.board)
+        if key != self._key:
+            index = defaultdict(lambda: defaultdict(list))
+            for move in self.board.legal_moves:
+                index[move.from_square][move.to_square].append(move)
+            self._index = {from_square: dict(targets) for from_square, targets in index.items()}
+            self._key = key
+        return self._index
+
+    def invalidate(self):
+        """Drop the index so the next query rebuilds it for the current position."""
+        self._key = None
+        self._index = {}
+
+    def targets(self, from_square: int) -> Dict[int, List[Move]]:
+        """Legal moves from ``from_square``, keyed by target square."""
+        return self._ensure().get(from_square, {})
+
+    def find(self, from_square: int, to_square: int) -> List[Move]:
+        """Legal moves from ``from_square`` to ``to_square`` (all promotion variants)."""
+        return self.targets(from_square).get(to_square, [])
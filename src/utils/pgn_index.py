@@ -0,0 +1,128 @@
+import io
+import mmap
+import os
+import struct
+from array import array
+from typing import Optional
+
+import chess.pgn
+
+# Index file layout: magic, size and mtime of the indexed PGN, game count, then one
+# unsigned 64-bit byte offset per game, in native byte order.
+INDEX_MAGIC = b"PGNIDX1\0"
+INDEX_HEADER = struct.Struct("=8sQQQ")
+FLUSH_EVERY = 65536
+
+
+class PgnIndex:
+    """
+    Byte-offset index of the games in a PGN file.
+
+    The index is built with a single streaming pass over the file and saved next to it as
+    ``<file>.idx``. Reopening a file whose size and modification time still match reuses
+    the saved index, which is memory-mapped rather than loaded. Games are only parsed when
+    they are read, so memory use does not grow with the size of the database.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index_path = path + ".idx"
+        self._mmap: Optional[mmap.mmap] = None
+        self._view: Optional[memoryview] = None
+        self._offsets: Optional[memoryview] = None
+
+    @classmethod
+    def open(cls, path: str) -> "PgnIndex":
+        """Open the index of ``path``, building and saving it first if it is missing or stale."""
+        index = cls(path)
+        if not index._load():
+            index.build()
+            if not index._load():
+                raise IOError(f"could not read index {index.index_path!r}")
+        return index
+
+    def __len__(self) -> int:
+        return len(self._offsets) if self._offsets is not None else 0
+
+    def _stat(self):
+        stat = os.stat(self.path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def _load(self) -> bool:
+        try:
+            with open(self.index_path, "rb") as f:
+                header = f.read(INDEX_HEADER.size)
+                if len(header) < INDEX_HEADER.size:
+                    return False
+                magic, size, mtime, count = INDEX_HEADER.unpack(header)
+                if magic != INDEX_MAGIC or (size, mtime) != self._stat():
+                    return False
+                if count == 0:
+                    self._offsets = memoryview(b"").cast("Q")
+                    return True
+                if os.fstat(f.fileno()).st_size < INDEX_HEADER.size + 8 * count:
+                    return False  # Cut short, e.g. by a crash while it was written
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return False
+        self._view = memoryview(self._mmap)
+        self._offsets = self._view[INDEX_HEADER.size:INDEX_HEADER.size + 8 * count].cast("Q")
+        return True
+
+    def build(self):
+        """Scan the PGN file once, writing the offset of every game to the index file."""
+        size, mtime = self._stat()
+        tmp_path = self.index_path + ".tmp"
+        count = 0
+        pending = array("Q")
+        with open(self.path, "rb") as pgn, open(tmp_path, "wb") as out:
+            out.write(INDEX_HEADER.pack(INDEX_MAGIC, size, mtime, 0))
+            offset = 0
+            in_headers = in_comment = False
+            for line in pgn:
+                stripped = line.lstrip(b"\xef\xbb\xbf \t") if offset == 0 else line.lstrip(b" \t")
+                if in_comment:
+                    # Inside a multi-line {...} comment, a leading "[" is not a tag.
+                    in_comment = line.rfind(b"{") > line.rfind(b"}") or b"}" not in line
+                elif stripped.startswith(b"["):
+                    if not in_headers:
+                        pending.append(offset)
+                        in_headers = True
+                elif stripped.strip():
+                    in_headers = False
+                    in_comment = line.rfind(b"{") > line.rfind(b"}")
+                offset += len(line)
+
+                if len(pending) >= FLUSH_EVERY:
+                    count += len(pending)
+                    out.write(pending.tobytes())
+                    pending = array("Q")
+            count += len(pending)
+            out.write(pending.tobytes())
+            out.seek(0)
+            out.write(INDEX_HEADER.pack(INDEX_MAGIC, size, mtime, count))
+        self.close()
+        os.replace(tmp_path, self.index_path)
+
+    def _reader(self, number: int) -> io.TextIOWrapper:
+        f = open(self.path, "rb")
+        f.seek(self._offsets[number])
+        return io.TextIOWrapper(f, encoding="utf-8-sig", errors="replace")
+
+    def read_headers(self, number: int) -> chess.pgn.Headers:
+        with self._reader(number) as f:
+            return chess.pgn.read_headers(f) or chess.pgn.Headers()
+
+    def read_game(self, number: int) -> Optional[chess.pgn.Game]:
+        with self._reader(number) as f:
+            return chess.pgn.read_game(f)
+
+    def close(self):
+        for view in (self._offsets, self._view):
+            if view is not None:
+                view.release()
+        self._offsets = self._view = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
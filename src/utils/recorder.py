@@ -0,0 +1,201 @@
+import asyncio
+import threading
+import time
+from array import array
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from .histogram import BUCKETS, SUB_BUCKET_BITS, SUB_BUCKETS, LatencyHistogram
+
+DEFAULT_CAPACITY = 1 << 16
+
+
+class TimingRecorder:
+    """
+    Fixed-size ring buffer of timed calls.
+
+    Function names are interned to integer ids, and every call is stored as five integers
+    (function id, start, duration and self time in ``perf_counter_ns`` nanoseconds, and the
+    track it ran on) in preallocated typed arrays, so recording a call allocates nothing and
+    memory use does not grow with the session. Once ``capacity`` calls have been recorded
+    the oldest ones are overwritten; ``dropped`` tells how many were lost.
+
+    ``update_histograms`` folds the calls recorded since its last run into a fixed-size
+    ``LatencyHistogram`` per function, which is never overwritten, so percentiles cover the
+    whole session. It is vectorized and meant to run off the hot path (the telemetry writer
+    calls it on every flush); calls overwritten before it runs are not counted.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        # Rounded up to a power of two so the slot is a mask instead of a modulo.
+        self.capacity = 1 << max(capacity - 1, 1).bit_length()
+        self.mask = self.capacity - 1
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        # Calls left before the next sampled one, per function id (see ExecutionTracker._wrap_sampled).
+        self.countdowns = array("i")
+        self.func_ids = array("I", bytes(4 * self.capacity))
+        self.starts = array("q", bytes(8 * self.capacity))
+        self.durations = array("q", bytes(8 * self.capacity))
+        self.self_durations = array("q", bytes(8 * self.capacity))
+        self.tracks = array("I", bytes(4 * self.capacity))
+        # Tracks are the threads and asyncio tasks spans run on (``tid`` of the Chrome trace).
+        self.track_names: List[str] = []
+        self._thread_tracks: Dict[int, int] = {}
+        self._task_tracks: Dict[asyncio.Task, int] = {}
+        self._free_tracks: List[int] = []
+        # BUCKETS counters per function id, back to back.
+        self.histogram_counts = np.zeros(0, dtype=np.uint64)
+        self._histogrammed = 0
+        self._histogram_lock = threading.Lock()
+        self.total = 0
+        # Offset from perf_counter_ns to wall-clock nanoseconds, for persisting timestamps.
+        self.epoch_ns = time.time_ns() - time.perf_counter_ns()
+
+    def intern(self, name: str) -> int:
+        """Integer id of ``name``, assigned on first use."""
+        func_id = self._ids.get(name)
+        if func_id is None:
+            func_id = self._ids[name] = len(self.names)
+            self.names.append(name)
+            self.countdowns.append(0)
+        return func_id
+
+    def _new_track(self, name: str) -> int:
+        if self._free_tracks:
+            track = self._free_tracks.pop()
+            self.track_names[track] = name
+        else:
+            track = len(self.track_names)
+            self.track_names.append(name)
+        return track
+
+    def thread_track(self) -> int:
+        """Track id of the current thread."""
+        key = threading.get_ident()
+        track = self._thread_tracks.get(key)
+        if track is None:
+            track = self._thread_tracks[key] = self._new_track(threading.current_thread().name)
+        return track
+
+    def task_track(self, task: asyncio.Task) -> int:
+        """
+        Track id of an asyncio task. The id is released when the task finishes and reused by
+        a later one, so there are only as many tracks as tasks running timed calls at once.
+        """
+        track = self._task_tracks.get(task)
+        if track is None:
+            track = self._task_tracks[task] = self._new_track(task.get_name())
+            task.add_done_callback(self._release_task_track)
+        return track
+
+    def _release_task_track(self, task: asyncio.Task):
+        self._free_tracks.append(self._task_tracks.pop(task))
+
+    def record(self, func_id: int, start_ns: int, end_ns: int, child_ns: int = 0, track: int = 0):
+        """Record a call; ``child_ns`` is the time spent in timed calls nested in it."""
+        total = self.total
+        slot = total & self.mask
+        self.func_ids[slot] = func_id
+        self.starts[slot] = start_ns
+        self.durations[slot] = duration = end_ns - start_ns
+        # Children running concurrently (e.g. gathered tasks) can add up to more than the parent.
+        self.self_durations[slot] = duration - child_ns if child_ns < duration else 0
+        self.tracks[slot] = track
+        # Published last: readers on other threads only look at slots below ``total``.
+        self.total = total + 1
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    @property
+    def dropped(self) -> int:
+        return max(self.total - self.capacity, 0)
+
+    @property
+    def oldest(self) -> int:
+        """Index (counting every call ever recorded) of the oldest call still in the buffer."""
+        return self.total - len(self)
+
+    def events(self) -> Iterator[Tuple[str, int, int]]:
+        """Recorded calls, oldest first, as ``(name, start_ns, duration_ns)``."""
+        for _, name, start, duration, _, _ in self.events_between(self.oldest, self.total):
+            yield name, start, duration
+
+    def events_between(self, first: int, stop: int) -> Iterator[Tuple[int, str, int, int, int, int]]:
+        """
+        Calls ``first`` to ``stop`` (exclusive, counting every call ever recorded) as
+        ``(index, name, start_ns, duration_ns, self_ns, track)``. ``first`` must not be older
+        than ``oldest``.
+        """
+        names, func_ids, starts, durations, mask = self.names, self.func_ids, self.starts, self.durations, self.mask
+        self_durations, tracks = self.self_durations, self.tracks
+        for index in range(first, stop):
+            slot = index & mask
+            yield index, names[func_ids[slot]], starts[slot], durations[slot], self_durations[slot], tracks[slot]
+
+    def update_histograms(self):
+        """Add the calls recorded since the last update to the per-function histograms."""
+        with self._histogram_lock:
+            stop = self.total
+            first = max(self._histogrammed, self.oldest)
+            self._histogrammed = stop
+            if first == stop:
+                return
+            slots = np.arange(first, stop, dtype=np.int64) & self.mask
+            func_ids = np.frombuffer(self.func_ids, dtype=np.uint32)[slots].astype(np.int64)
+            durations = np.maximum(np.frombuffer(self.durations, dtype=np.int64)[slots], 0)
+
+            # histogram.bucket_of, vectorized: frexp's exponent is the bit length of the duration.
+            exponents = np.maximum(np.frexp(durations.astype(np.float64))[1] - SUB_BUCKET_BITS - 1, 0)
+            buckets = np.where(
+                durations < SUB_BUCKETS,
+                durations,
+                ((exponents + 1) << SUB_BUCKET_BITS) + (durations >> exponents) - SUB_BUCKETS,
+            )
+            np.minimum(buckets, BUCKETS - 1, out=buckets)
+
+            size = len(self.names) * BUCKETS
+            if len(self.histogram_counts) < size:
+                self.histogram_counts = np.concatenate(
+                    (self.histogram_counts, np.zeros(size - len(self.histogram_counts), dtype=np.uint64))
+                )
+            self.histogram_counts += np.bincount(func_ids * BUCKETS + buckets, minlength=size).astype(np.uint64)
+
+    def histogram(self, func_id: int) -> LatencyHistogram:
+        """Copy of the latency histogram of ``func_id``, as of the last ``update_histograms``."""
+        start = func_id * BUCKETS
+        counts = self.histogram_counts[start:start + BUCKETS]
+        if len(counts) < BUCKETS:
+            return LatencyHistogram()
+        return LatencyHistogram(array("Q", counts.tobytes()))
+
+    def histograms(self) -> Dict[str, LatencyHistogram]:
+        """Histograms of every function called at least once, by name."""
+        histograms = {}
+        for func_id, name in enumerate(self.names):
+            histogram = self.histogram(func_id)
+            if any(histogram.counts):
+                histograms[name] = histogram
+        return histograms
+
+
+def measure_overhead(wrap: Callable[[Callable], Callable], calls: int = 100_000) -> float:
+    """
+    Nanoseconds that decorating a function with ``wrap`` adds to each call, measured as the
+    difference between calling an empty function ``calls`` times with and without it.
+    """
+    def noop():
+        pass
+
+    wrapped = wrap(noop)
+    clock = time.perf_counter_ns
+    start = clock()
+    for _ in range(calls):
+        noop()
+    bare = clock() - start
+    start = clock()
+    for _ in range(calls):
+        wrapped()
+    return max(clock() - start - bare, 0) / calls
@@ -0,0 +1,148 @@
+import math
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from .db_operations import get_commit_session_ids, get_merged_histograms, get_session_ids
+from .histogram import LatencyHistogram, format_ns
+from .models import get_sync_engine, init_sync_db
+
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_ALPHA = 0.01
+# Functions with fewer calls than this on either side are listed but never flagged.
+MIN_SAMPLES = 20
+
+
+class Comparison(NamedTuple):
+    name: str
+    base_calls: int
+    head_calls: int
+    base_p50: int
+    head_p50: int
+    base_p95: int
+    head_p95: int
+    # Probability that a call of head is slower than one of base (0.5: same distribution).
+    slower: float
+    p_value: float
+
+    @property
+    def ratio(self) -> float:
+        return self.head_p50 / self.base_p50 if self.base_p50 else 1.0
+
+
+def mann_whitney(base: LatencyHistogram, head: LatencyHistogram) -> Tuple[float, float]:
+    """
+    One-sided Mann-Whitney U test of "head is slower than base", computed on the histogram
+    buckets (durations in the same bucket count as ties), with the normal approximation and
+    tie correction. Returns ``(P(head > base), p_value)``.
+    """
+    a = np.asarray(base.counts, dtype=np.float64)
+    b = np.asarray(head.counts, dtype=np.float64)
+    n1, n2 = float(a.sum()), float(b.sum())
+    if not n1 or not n2:
+        return 0.5, 1.0
+    below = np.cumsum(a) - a  # Base calls in lower buckets than each bucket
+    u = float(np.dot(b, below) + 0.5 * np.dot(a, b))
+
+    n = n1 + n2
+    ties = a + b
+    variance = n1 * n2 / 12 * ((n + 1) - float(np.dot(ties, ties * ties - 1)) / (n * (n - 1)))
+    if variance <= 0:
+        return u / (n1 * n2), 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return u / (n1 * n2), 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare(base: Dict[str, LatencyHistogram], head: Dict[str, LatencyHistogram]) -> List[Comparison]:
+    """Compare every function present on both sides, slowest-growing median first."""
+    comparisons = []
+    for name in base.keys() & head.keys():
+        before, after = base[name], head[name]
+        slower, p_value = mann_whitney(before, after)
+        comparisons.append(Comparison(
+            name, before.total, after.total,
+            before.percentile(50), after.percentile(50), before.percentile(95), after.percentile(95),
+            slower, p_value,
+        ))
+    return sorted(comparisons, key=lambda comparison: comparison.ratio, reverse=True)
+
+
+def is_regression(comparison: Comparison, threshold: float, alpha: float) -> bool:
+    return (
+        min(comparison.base_calls, comparison.head_calls) >= MIN_SAMPLES
+        and comparison.p_value < alpha
+        and comparison.ratio > 1 + threshold
+    )
+
+
+def select_sessions(session: Session, selector: str) -> List[str]:
+    """
+    Sessions named by ``selector``: ``sessions:N`` or ``sessions:N-M`` (1-based, oldest first,
+    as numbered in the 3D plot), ``session:ID`` or a commit hash (prefix), which selects the
+    sessions run on that commit, including those with uncommitted changes on top of it.
+    """
+    if selector.startswith("sessions:"):
+        first, _, last = selector[len("sessions:"):].partition("-")
+        ids = get_session_ids(session)
+        return ids[int(first) - 1:int(last or first)]
+    if selector.startswith("session:"):
+        session_id = selector[len("session:"):]
+        return [session_id] if session_id in get_session_ids(session) else []
+    return get_commit_session_ids(session, selector)
+
+
+def run_regression_report(
+        base: str,
+        head: str,
+        db_path: str = "execution_data.db",
+        threshold: float = DEFAULT_THRESHOLD,
+        alpha: float = DEFAULT_ALPHA,
+) -> int:
+    """
+    Print how the latency of every instrumented function changed from the ``base`` sessions
+    to the ``head`` sessions (see ``select_sessions``). A function regresses when its median
+    grew by more than ``threshold`` and the Mann-Whitney test is significant at ``alpha``.
+    Returns the process exit code: 1 if any function regressed, 2 if a side has no data.
+    """
+    engine = get_sync_engine(db_path)
+    init_sync_db(engine)
+    with Session(engine) as session:
+        sides = {}
+        for label, selector in (("base", base), ("head", head)):
+            ids = select_sessions(session, selector)
+            if not ids:
+                print(f"No sessions found for {label} '{selector}'")
+                engine.dispose()
+                return 2
+            sides[label] = ids, get_merged_histograms(session, ids)
+    engine.dispose()
+
+    (base_ids, base_histograms), (head_ids, head_histograms) = sides["base"], sides["head"]
+    comparisons = compare(base_histograms, head_histograms)
+    print(f"base: {base} ({len(base_ids)} sessions), head: {head} ({len(head_ids)} sessions)")
+    if not comparisons:
+        print("No function was recorded on both sides")
+        return 2
+
+    print(f"{'function':<28} {'calls':>15} {'p50':>21} {'change':>8} {'p95':>21} {'P(slower)':>9} {'p-value':>8}")
+    regressions = 0
+    for comparison in comparisons:
+        if is_regression(comparison, threshold, alpha):
+            regressions += 1
+            verdict = "REGRESSION"
+        elif min(comparison.base_calls, comparison.head_calls) < MIN_SAMPLES:
+            verdict = "few calls"
+        else:
+            verdict = ""
+        print(f"{comparison.name:<28} {comparison.base_calls:>7}/{comparison.head_calls:<7} "
+              f"{format_ns(comparison.base_p50):>10}/{format_ns(comparison.head_p50):<10} "
+              f"{comparison.ratio - 1:>+8.0%} "
+              f"{format_ns(comparison.base_p95):>10}/{format_ns(comparison.head_p95):<10} "
+              f"{comparison.slower:>9.2f} {comparison.p_value:>8.1e} {verdict}")
+
+    only = (base_histograms.keys() ^ head_histograms.keys())
+    if only:
+        print(f"Not compared (recorded on one side only): {', '.join(sorted(only))}")
+    print(f"{regressions} regression(s) (median +{threshold:.0%}, p < {alpha})")
+    return 1 if regressions else 0
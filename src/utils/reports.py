@@ -0,0 +1,26 @@
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from .db_operations import get_function_histograms
+from .histogram import format_ns
+from .models import get_sync_engine, init_sync_db
+
+
+def show_percentiles(db_path: str = "execution_data.db", session_id: Optional[str] = None):
+    """Print p50/p95/p99/max of every instrumented function of a session (the latest by default)."""
+    engine = get_sync_engine(db_path)
+    init_sync_db(engine)
+    with Session(engine) as session:
+        histograms = get_function_histograms(session, session_id)
+    engine.dispose()
+    if not histograms:
+        print("No latency histograms stored")
+        return
+
+    print(f"{'function':<28} {'calls':>8} {'p50':>10} {'p95':>10} {'p99':>10} {'max':>10}")
+    ordered = sorted(histograms.items(), key=lambda item: item[1].percentile(99), reverse=True)
+    for name, histogram in ordered:
+        print(f"{name:<28} {histogram.total:>8} " +
+              " ".join(f"{format_ns(value):>10}" for value in (
+                  histogram.percentile(50), histogram.percentile(95), histogram.percentile(99), histogram.max)))
@@ -0,0 +1,141 @@
+import sys
+import threading
+import time
+from typing import Optional
+
+from .chrome_trace import ChromeTraceWriter
+from .recorder import TimingRecorder
+
+
+class TelemetryWriter:
+    """
+    Writes the calls recorded by a ``TimingRecorder`` to the execution database from a
+    background thread while the session runs.
+
+    Every ``poll`` seconds the thread checks how many calls are pending and flushes them
+    once there are ``batch_size`` of them or ``interval`` seconds have passed since the last
+    flush. Each batch of at most ``batch_size`` calls is committed in its own transaction,
+    so a crash loses at most the calls since the last flush, and the ring buffer only has
+    to hold the calls of one interval. The latency histograms of the session are rewritten
+    on every flush. With a ``trace_path`` the calls are also streamed to a Chrome trace (see
+    ``ChromeTraceWriter``). ``close`` stops the thread and writes what is left; calling it
+    again (e.g. from another exit handler) does nothing.
+    """
+
+    def __init__(
+            self,
+            recorder: TimingRecorder,
+            session_id: str,
+            db_uri: str = "execution_data.db",
+            interval: float = 5.0,
+            batch_size: int = 10_000,
+            poll: float = 0.5,
+            trace_path: Optional[str] = None,
+    ):
+        self.recorder = recorder
+        self.session_id = session_id
+        self.db_uri = db_uri
+        self.interval = interval
+        self.batch_size = batch_size
+        self.poll = poll
+        self.trace = ChromeTraceWriter(trace_path) if trace_path else None
+        # Index (counting every call ever recorded) of the next call to write.
+        self.flushed = 0
+        # Calls overwritten in the ring buffer before they could be written.
+        self.lost = 0
+        self._engine = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while not self._stop.wait(self.poll):
+            pending = self.recorder.total - self.flushed
+            if pending >= self.batch_size or (pending and time.monotonic() - last_flush >= self.interval):
+                try:
+                    self.flush()
+                except Exception as e:
+                    print(f"Error flushing execution data: {e}", file=sys.stderr)
+                last_flush = time.monotonic()
+
+    def _get_engine(self):
+        # Imported here so the database code is only loaded once something is written.
+        from .models import get_sync_engine, init_sync_db
+
+        if self._engine is None:
+            self._engine = get_sync_engine(self.db_uri)
+            init_sync_db(self._engine)
+        return self._engine
+
+    def flush(self) -> int:
+        """Write every call recorded so far that was not written yet. Returns how many were written."""
+        from .db_operations import save_execution_events, save_execution_session, save_function_histograms
+
+        with self._lock:
+            recorder = self.recorder
+            stop = recorder.total
+            first = max(self.flushed, recorder.oldest)
+            self.lost += first - self.flushed
+            self.flushed = first
+            if first == stop:
+                return 0
+
+            engine = self._get_engine()
+            epoch = recorder.epoch_ns
+            with engine.begin() as conn:
+                save_execution_session(conn, self.session_id)
+            for batch_start in range(first, stop, self.batch_size):
+                batch_stop = min(batch_start + self.batch_size, stop)
+                spans = list(recorder.events_between(batch_start, batch_stop))
+                # Slots the app overwrote (a whole ring lap ahead) while they were being read.
+                overwritten = min(recorder.oldest - batch_start, len(spans))
+                if overwritten > 0:
+                    self.lost += overwritten
+                    spans = spans[overwritten:]
+                events = [
+                    (index, name, (start + epoch) / 1e9, (start + duration + epoch) / 1e9, self_duration / 1e9)
+                    for index, name, start, duration, self_duration, _ in spans
+                ]
+                with engine.begin() as conn:
+                    save_execution_events(conn, self.session_id, events)
+                if self.trace is not None:
+                    self.trace.write(spans, recorder.track_names)
+                self.flushed = batch_stop
+            recorder.update_histograms()
+            with engine.begin() as conn:
+                save_function_histograms(conn, self.session_id, {
+                    name: histogram.to_bytes() for name, histogram in recorder.histograms().items()
+                })
+            return stop - first
+
+    def close(self, git_commit: Optional[str] = None, head_commit: Optional[str] = None):
+        """
+        Stop the background thread, write the remaining calls and the commit of the session
+        (with the HEAD it was made on, if it is a snapshot of a dirty tree).
+        """
+        from .db_operations import save_execution_session, save_git_commit
+
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        if git_commit:
+            with self._get_engine().begin() as conn:
+                save_execution_session(conn, self.session_id)
+                save_git_commit(conn, self.session_id, git_commit, head_commit)
+        if self.trace is not None:
+            self.trace.close()
+        if self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
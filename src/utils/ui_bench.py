@@ -0,0 +1,188 @@
+import asyncio
+import io
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+import chess
+import chess.pgn
+
+from src.app import ChessApp
+from src.components.promotion_screen import PromotionScreen
+
+# Scripted games replayed by clicking the board. They cover castling, en passant, checks,
+# a checkmate and promotions for both colors, including an under-promotion.
+BENCH_GAMES = [
+    "1. e4 e5 2. Nf3 d6 3. d4 Bg4 4. dxe5 Bxf3 5. Qxf3 dxe5 6. Bc4 Nf6 7. Qb3 Qe7 8. Nc3 c6 9. Bg5 b5 "
+    "10. Nxb5 cxb5 11. Bxb5+ Nbd7 12. O-O-O Rd8 13. Rxd7 Rxd7 14. Rd1 Qe6 15. Bxd7+ Nxd7 16. Qb8+ Nxb8 17. Rd8#",
+    "1. a4 h5 2. a5 h4 3. a6 h3 4. axb7 hxg2 5. bxa8=N gxh1=Q 6. e4 d5 7. e5 f5 8. exf6 gxf6",
+    "1. d4 Nf6 2. c4 e6 3. Nc3 Bb4 4. e3 O-O 5. Bd3 d5 6. Nf3 c5 7. O-O Nc6 8. a3 Bxc3 9. bxc3 dxc4 "
+    "10. Bxc4 Qc7 11. Bd3 e5 12. Qc2 Re8 13. Nxe5 Nxe5 14. dxe5 Qxe5 15. f3 Bd7",
+]
+
+DEFAULT_BASELINE = "ui_bench.json"
+DEFAULT_THRESHOLD = 0.25
+CLICK_TIMEOUT = 10.0
+# Percentiles of fewer samples than this are reported but not compared with the baseline.
+MIN_SAMPLES = 10
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = percent / 100 * (len(ordered) - 1)
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def _summary(samples_ms: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(samples_ms),
+        "mean_ms": round(statistics.fmean(samples_ms), 3) if samples_ms else 0.0,
+        "p50_ms": round(_percentile(samples_ms, 50), 3),
+        "p95_ms": round(_percentile(samples_ms, 95), 3),
+        "p99_ms": round(_percentile(samples_ms, 99), 3),
+    }
+
+
+async def _wait_until(pilot, condition) -> None:
+    deadline = time.perf_counter() + CLICK_TIMEOUT
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("the board did not react to the click")
+        await pilot.pause()
+
+
+async def _replay(app, pilot, game: chess.pgn.Game, select: List[float], move: List[float],
+                  promotion: List[float]):
+    promotion_buttons = {
+        chess.QUEEN: "#queen-promo",
+        chess.ROOK: "#rook-promo",
+        chess.BISHOP: "#bishop-promo",
+        chess.KNIGHT: "#knight-promo",
+    }
+    for game_move in game.mainline_moves():
+        cells = app.board_container.cells
+        ply = app.history.ply
+
+        start = time.perf_counter()
+        await pilot.click(cells[game_move.from_square])
+        await _wait_until(pilot, lambda: app.selected_square == game_move.from_square)
+        select.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await pilot.click(cells[game_move.to_square])
+        if game_move.promotion:
+            await _wait_until(pilot, lambda: isinstance(app.screen, PromotionScreen))
+            start = time.perf_counter()
+            await pilot.click(promotion_buttons[game_move.promotion])
+            await _wait_until(pilot, lambda: app.history.ply == ply + 1)
+            promotion.append((time.perf_counter() - start) * 1000)
+        else:
+            await _wait_until(pilot, lambda: app.history.ply == ply + 1)
+            move.append((time.perf_counter() - start) * 1000)
+        await pilot.pause()
+
+
+async def _run(rounds: int, analysis: bool, trace_memory: bool) -> Dict:
+    games = [chess.pgn.read_game(io.StringIO(pgn)) for pgn in BENCH_GAMES]
+    select, move, promotion = [], [], []
+    if trace_memory:
+        tracemalloc.start()
+
+    app = ChessApp()
+    app.analysis_enabled = analysis
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        for _ in range(rounds):
+            for game in games:
+                await _replay(app, pilot, game, select, move, promotion)
+                while len(app.screen_stack) > 1:
+                    app.pop_screen()
+                await app.reset_game()
+                await pilot.pause()
+        widgets = len(list(app.screen.walk_children(with_self=True)))
+
+    peak = 0
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {
+        "rounds": rounds,
+        "analysis": analysis,
+        "select": _summary(select),
+        "move": _summary(move),
+        "promotion": _summary(promotion),
+        "widgets": widgets,
+        "peak_memory_kb": peak // 1024,
+    }
+
+
+def compare(result: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Regressions of ``result`` against ``baseline``: every latency percentile, the widget
+    count and the peak memory that grew by more than ``threshold`` (0.25 = 25%).
+    """
+    regressions = []
+    for name in ("select", "move", "promotion"):
+        if result[name]["count"] < MIN_SAMPLES:
+            continue
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            old, new = baseline.get(name, {}).get(key), result[name][key]
+            if old and new > old * (1 + threshold):
+                regressions.append(f"{name} {key}: {old} -> {new}")
+    for key in ("widgets", "peak_memory_kb"):
+        old, new = baseline.get(key), result[key]
+        if old and new > old * (1 + threshold):
+            regressions.append(f"{key}: {old} -> {new}")
+    return regressions
+
+
+def run_ui_bench(
+        baseline_path: str = DEFAULT_BASELINE,
+        threshold: float = DEFAULT_THRESHOLD,
+        rounds: int = 2,
+        update_baseline: bool = False,
+        analysis: bool = False,
+) -> int:
+    """
+    Replay ``BENCH_GAMES`` ``rounds`` times through real clicks on a headless ``ChessApp`` and print the
+    click latencies, widget count and peak memory. The result is compared with the JSON
+    baseline at ``baseline_path``, which is written if it does not exist yet or
+    ``update_baseline`` is set. Returns 1 if any metric regressed by more than ``threshold``.
+    """
+    # tracemalloc slows every allocation down, so latencies and peak memory are measured
+    # in separate runs.
+    result = asyncio.run(_run(rounds, analysis, trace_memory=False))
+    result["peak_memory_kb"] = asyncio.run(_run(1, analysis, trace_memory=True))["peak_memory_kb"]
+    for name in ("select", "move", "promotion"):
+        stats = result[name]
+        print(f"{name:<10} n={stats['count']:<4} mean {stats['mean_ms']:>8.2f} ms  p50 {stats['p50_ms']:>8.2f} ms"
+              f"  p95 {stats['p95_ms']:>8.2f} ms  p99 {stats['p99_ms']:>8.2f} ms")
+    print(f"widgets {result['widgets']}, peak memory {result['peak_memory_kb']} KiB")
+
+    baseline: Optional[Dict] = None
+    if os.path.exists(baseline_path) and not update_baseline:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+    if baseline is None:
+        with open(baseline_path, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Baseline written to {baseline_path}")
+        return 0
+
+    regressions = compare(result, baseline, threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print(f"No regression over {threshold:.0%} against {baseline_path}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(run_ui_bench())
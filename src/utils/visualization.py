@@ -2,7 +2,7 @@ import pandas as pd
 import plotly.graph_objects as go
 from sqlalchemy.orm import Session
 from .models import get_sync_engine
-from .db_operations import get_execution_stats
+from .db_operations import get_execution_stats, get_function_percentiles
 
 def show_execution_visuals():
     """
@@ -11,7 +11,8 @@ def show_execution_visuals():
     The visualization shows:
     - Function execution times across different sessions
     - Number of executions per function
-    - Average execution time trends
+    - Average execution time trends, with p50/p95/p99 from the latency histograms and the
+      average self time (excluding nested timed calls)
     
     The plot features:
     - 3D scatter plot with connected lines
@@ -30,6 +31,8 @@ def show_execution_visuals():
     with Session(engine) as session:
         # Fetch execution statistics from database
         result = get_execution_stats(session)
+        # Tail latencies from the stored histograms (0 for sessions saved before they existed)
+        percentiles = get_function_percentiles(session)
         # Create data structure for DataFrame
         data = {
             'function_name': [],
@@ -37,7 +40,11 @@ def show_execution_visuals():
             'min_time': [],
             'avg_time': [],
             'max_time': [],
-            'session_id': []
+            'session_id': [],
+            'p50_time': [],
+            'p95_time': [],
+            'p99_time': [],
+            'avg_self_time': [],
         }
         # Populate data dictionary from query results
         for row in result:
@@ -47,6 +54,11 @@ def show_execution_visuals():
             data['avg_time'].append(row[3])
             data['max_time'].append(row[4])
             data['session_id'].append(row[5])
+            p50, p95, p99, _ = percentiles.get((row[5], row[0]), (0.0, 0.0, 0.0, 0.0))
+            data['p50_time'].append(p50)
+            data['p95_time'].append(p95)
+            data['p99_time'].append(p99)
+            data['avg_self_time'].append(row[6])
         
         # Create DataFrame and sort by session_id to maintain chronological order
         df = pd.DataFrame(data)
@@ -100,12 +112,15 @@ def show_execution_visuals():
             hovertemplate=(
                 "<b>%{text}</b><br>" +
                 "Session: %{x}<br>" +
-                "Executions: %{customdata}<br>" +
+                "Executions: %{customdata[0]}<br>" +
                 "Avg Time: %{z:.6f}s<br>" +
+                "Avg Self Time: %{customdata[5]:.6f}s<br>" +
+                "p50 / p95 / p99: %{customdata[1]:.6f}s / %{customdata[2]:.6f}s / %{customdata[3]:.6f}s<br>" +
+                "Max Time: %{customdata[4]:.6f}s<br>" +
                 "<extra></extra>"
             ),
             text=[function] * len(function_data),
-            customdata=function_data['execution_count']
+            customdata=function_data[['execution_count', 'p50_time', 'p95_time', 'p99_time', 'max_time', 'avg_self_time']].to_numpy()
         ))
 
     # Configure layout settings
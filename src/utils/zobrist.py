@@ -0,0 +1,55 @@
+import chess
+from chess import Board, Move
+from chess.polyglot import POLYGLOT_RANDOM_ARRAY, ZobristHasher
+
+_hasher = ZobristHasher(POLYGLOT_RANDOM_ARRAY)
+
+
+def _piece_key(piece_type: chess.PieceType, color: chess.Color, square: int) -> int:
+    return POLYGLOT_RANDOM_ARRAY[64 * ((piece_type - 1) * 2 + color) + square]
+
+
+def piece_delta(board: Board, move: Move) -> int:
+    """
+    XOR of the piece-square keys that change when ``move`` is played on ``board``.
+    Must be called before the move is pushed.
+    """
+    piece_type = board.piece_type_at(move.from_square)
+    if piece_type is None:  # null move
+        return 0
+    color = board.turn
+    delta = _piece_key(piece_type, color, move.from_square)
+
+    if board.is_castling(move):
+        rank = chess.square_rank(move.from_square)
+        kingside = board.is_kingside_castling(move)
+        rook_from = move.to_square if board.chess960 else chess.square(7 if kingside else 0, rank)
+        rook_to = chess.square(5 if kingside else 3, rank)
+        king_to = chess.square(6 if kingside else 2, rank)
+        return (delta ^ _piece_key(chess.KING, color, king_to) ^
+                _piece_key(chess.ROOK, color, rook_from) ^ _piece_key(chess.ROOK, color, rook_to))
+
+    delta ^= _piece_key(move.promotion or piece_type, color, move.to_square)
+    captured = board.piece_type_at(move.to_square)
+    if captured is not None:
+        delta ^= _piece_key(captured, not color, move.to_square)
+    elif piece_type == chess.PAWN and move.to_square == board.ep_square:
+        captured_square = chess.square(chess.square_file(move.to_square), chess.square_rank(move.from_square))
+        delta ^= _piece_key(chess.PAWN, not color, captured_square)
+    return delta
+
+
+def state_hash(board: Board) -> int:
+    """Part of the Zobrist hash that does not depend on piece placement: castling, en passant and turn."""
+    return _hasher.hash_castling(board) ^ _hasher.hash_ep_square(board) ^ _hasher.hash_turn(board)
+
+
+def push(board: Board, move: Move, key: int) -> int:
+    """
+    Push ``move`` on ``board`` and return the Zobrist hash of the new position, updated
+    incrementally from ``key``, the hash of the position before the move.
+    The result matches ``chess.polyglot.zobrist_hash``.
+    """
+    delta = piece_delta(board, move) ^ state_hash(board)
+    board.push(move)
+    return key ^ delta ^ state_hash(board)
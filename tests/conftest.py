@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The modules under test are imported as ``src.…`` from the repository root, and the tests
+# must not start the @timeit tracker (exit handlers, database writes).
+os.environ.setdefault("CHESS_PROFILE", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
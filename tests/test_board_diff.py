@@ -0,0 +1,35 @@
+import random
+
+import chess
+import pytest
+
+from src.utils.board_diff import changed_squares
+
+
+def diff(before: chess.Board, after: chess.Board):
+    return {square for square in chess.SQUARES if before.piece_at(square) != after.piece_at(square)}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_changed_squares_match_board_diff(seed):
+    rng = random.Random(seed)
+    board = chess.Board()
+    for _ in range(200):
+        moves = list(board.legal_moves)
+        if not moves:
+            break
+        special = [m for m in moves if board.is_castling(m) or board.is_en_passant(m) or m.promotion]
+        move = rng.choice(special) if special and rng.random() < 0.5 else rng.choice(moves)
+        before = board.copy(stack=False)
+        squares = changed_squares(board, move)
+        board.push(move)
+        assert squares == diff(before, board), (before.fen(), move.uci())
+
+
+@pytest.mark.parametrize("fen, uci, expected", [
+    ("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1", "e1g1", {chess.E1, chess.G1, chess.H1, chess.F1}),
+    ("r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 0 1", "e8c8", {chess.E8, chess.C8, chess.A8, chess.D8}),
+    ("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1", "e5d6", {chess.E5, chess.D6, chess.D5}),
+])
+def test_special_moves(fen, uci, expected):
+    assert changed_squares(chess.Board(fen), chess.Move.from_uci(uci)) == expected
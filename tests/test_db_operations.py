@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.utils.db_operations import _bulk_insert, get_execution_stats, save_execution_events, save_execution_session
+from src.utils.models import (
+    ExecutionOrder, ExecutionTime, FunctionStats, TimelineEvent, get_sync_engine, init_sync_db
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = get_sync_engine(str(tmp_path / "execution_data.db"))
+    init_sync_db(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_save_execution_events(engine):
+    events = [(0, "a", 10.0, 10.5, 0.25), (1, "b", 11.0, 11.25, 0.25)]
+    with engine.begin() as conn:
+        save_execution_session(conn, "s1")
+        save_execution_events(conn, "s1", events)
+
+    with Session(engine) as session:
+        assert session.execute(
+            select(ExecutionTime.function_name, ExecutionTime.execution_time).order_by(ExecutionTime.id)
+        ).all() == [("a", 0.5), ("b", 0.25)]
+        assert session.execute(
+            select(ExecutionOrder.order_index, ExecutionOrder.function_name).order_by(ExecutionOrder.order_index)
+        ).all() == [(0, "a"), (1, "b")]
+        assert session.execute(
+            select(TimelineEvent.function_name, TimelineEvent.start_time, TimelineEvent.end_time)
+            .order_by(TimelineEvent.start_time)
+        ).all() == [("a", 10.0, 10.5), ("b", 11.0, 11.25)]
+
+
+def test_bulk_insert_rejects_columns_out_of_table_order(engine):
+    with engine.begin() as conn:
+        save_execution_session(conn, "s1")
+        with pytest.raises(ValueError):
+            _bulk_insert(conn, ExecutionTime.__table__, ("execution_time", "session_id", "function_name"),
+                         [(0.5, "s1", "a")])
+
+
+def test_function_stats_merge_batches(engine):
+    with engine.begin() as conn:
+        save_execution_session(conn, "s1")
+        save_execution_events(conn, "s1", [(0, "a", 0.0, 1.0, 0.5), (1, "b", 1.0, 1.5, 0.5)])
+    with engine.begin() as conn:
+        save_execution_events(conn, "s1", [(2, "a", 2.0, 5.0, 1.0), (3, "a", 5.0, 7.0, 2.0)])
+
+    with Session(engine) as session:
+        stats = session.execute(select(FunctionStats).where(FunctionStats.function_name == "a")).scalar_one()
+        assert (stats.call_count, stats.min_time, stats.max_time) == (3, 1.0, 3.0)
+        assert (stats.total_time, stats.total_time_sq, stats.self_time) == (6.0, 14.0, 3.5)
+
+        rows = {row.function_name: row for row in get_execution_stats(session)}
+        assert rows["a"].execution_count == 3 and rows["a"].avg_time == 2.0 and rows["a"].avg_self_time == 3.5 / 3
+        assert rows["b"].execution_count == 1 and rows["b"].max_time == 0.5
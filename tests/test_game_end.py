@@ -0,0 +1,76 @@
+import chess
+from chess import Termination
+
+from src.utils.game_end import RepetitionTracker, describe, outcome
+
+KNIGHT_SHUFFLE = ["g1f3", "g8f6", "f3g1", "f6g8"]
+
+
+def play(board: chess.Board, tracker: RepetitionTracker, ucis):
+    for uci in ucis:
+        tracker.push(board, chess.Move.from_uci(uci))
+
+
+def test_threefold_and_fivefold_repetition():
+    board = chess.Board()
+    tracker = RepetitionTracker(board)
+    play(board, tracker, KNIGHT_SHUFFLE)
+    assert tracker.count() == 2
+    assert outcome(board, tracker) is None
+
+    play(board, tracker, KNIGHT_SHUFFLE)
+    assert tracker.count() == 3
+    assert outcome(board, tracker).termination == Termination.THREEFOLD_REPETITION
+
+    play(board, tracker, KNIGHT_SHUFFLE * 2)
+    assert tracker.count() == 5
+    result = outcome(board, tracker)
+    assert result.termination == Termination.FIVEFOLD_REPETITION
+    assert describe(result) == "Draw by fivefold repetition (1/2-1/2)"
+
+
+def test_repetitions_follow_the_cursor():
+    board = chess.Board()
+    tracker = RepetitionTracker(board)
+    play(board, tracker, KNIGHT_SHUFFLE * 2)
+    assert tracker.count() == 3
+    tracker.seek(4)
+    assert tracker.count() == 2
+    tracker.seek(0)
+    assert tracker.count() == 1
+    tracker.seek(8)
+    assert tracker.count() == 3
+
+
+def test_fifty_and_seventy_five_move_rules():
+    board = chess.Board("8/8/4k3/8/8/4K3/4R3/8 w - - 99 80")
+    tracker = RepetitionTracker(board)
+    assert outcome(board, tracker) is None
+    play(board, tracker, ["e2d2"])
+    assert outcome(board, tracker).termination == Termination.FIFTY_MOVES
+
+    board = chess.Board("8/8/4k3/8/8/4K3/4R3/8 w - - 149 105")
+    tracker = RepetitionTracker(board)
+    play(board, tracker, ["e2d2"])
+    assert outcome(board, tracker).termination == Termination.SEVENTYFIVE_MOVES
+
+    # A pawn move resets the clock.
+    board = chess.Board("8/8/4k3/8/8/4K3/4P3/8 w - - 99 80")
+    tracker = RepetitionTracker(board)
+    play(board, tracker, ["e2e4"])
+    assert outcome(board, tracker) is None
+
+
+def test_checkmate_stalemate_and_insufficient_material():
+    board = chess.Board()
+    tracker = RepetitionTracker(board)
+    play(board, tracker, ["f2f3", "e7e5", "g2g4", "d8h4"])
+    result = outcome(board, tracker)
+    assert (result.termination, result.winner) == (Termination.CHECKMATE, chess.BLACK)
+    assert describe(result) == "Checkmate! Black wins (0-1)"
+
+    board = chess.Board("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1")
+    assert outcome(board, RepetitionTracker(board)).termination == Termination.STALEMATE
+
+    board = chess.Board("8/8/4k3/8/8/4K3/4N3/8 w - - 0 1")
+    assert outcome(board, RepetitionTracker(board)).termination == Termination.INSUFFICIENT_MATERIAL
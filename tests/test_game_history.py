@@ -0,0 +1,62 @@
+import chess
+import chess.polyglot
+
+from src.utils.game_history import GameHistory
+
+
+def test_history_seek_matches_replay():
+    ucis = ("e2e4 e7e5 g1f3 b8c6 f1c4 g8f6 d2d3 f8c5 e1g1 d7d6 c2c3 e8g8 b1d2 a7a6 a2a4 c8e6 "
+            "c4e6 f7e6 d1b3 d8d7 b3b7 a8b8 b7a6 b8b2 a6c4 g8h8 a1a2 b2a2").split()
+    board = chess.Board()
+    history = GameHistory(board, interval=4)
+    for uci in ucis:
+        history.push(board, chess.Move.from_uci(uci))
+
+    for ply in (0, 27, 3, 4, 5, 13, 12, 28, 1, 17, 16, 28):
+        history.seek(board, ply)
+        expected = chess.Board()
+        for uci in ucis[:ply]:
+            expected.push_uci(uci)
+        assert board.fen() == expected.fen()
+        assert history.ply == ply
+        assert history.repetitions.key == chess.polyglot.zobrist_hash(expected)
+        assert history.last_move() == (chess.Move.from_uci(ucis[ply - 1]) if ply else None)
+
+
+def test_history_redo_and_truncate():
+    board = chess.Board()
+    history = GameHistory(board, interval=2)
+    for uci in ["e2e4", "e7e5", "g1f3", "b8c6"]:
+        history.push(board, chess.Move.from_uci(uci))
+    history.seek(board, 2)
+
+    # Replaying the next move of the line keeps the rest of it.
+    assert history.push(board, chess.Move.from_uci("g1f3")) == "Nf3"
+    assert len(history.moves) == 4
+
+    # A different move cuts the line at the cursor.
+    assert history.push(board, chess.Move.from_uci("g8f6")) == "Nf6"
+    assert history.sans == ["e4", "e5", "Nf3", "Nf6"]
+    history.seek(board, 0)
+    history.seek(board, 4)
+    assert board.fen() == chess.Board("rnbqkb1r/pppp1ppp/5n2/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3").fen()
+
+
+def test_history_reports_first_changed_ply():
+    board = chess.Board()
+    history = GameHistory(board)
+    assert history.take_changed() is None
+    for uci in ["e2e4", "e7e5", "g1f3", "b8c6"]:
+        history.push(board, chess.Move.from_uci(uci))
+    assert history.take_changed() is None
+
+    history.seek(board, 1)
+    history.push(board, chess.Move.from_uci("e7e5"))
+    assert history.take_changed() is None
+    history.push(board, chess.Move.from_uci("f1c4"))
+    history.push(board, chess.Move.from_uci("g8f6"))
+    assert history.take_changed() == 2
+    assert history.take_changed() is None
+
+    history.reset(board)
+    assert history.take_changed() == 0
@@ -0,0 +1,47 @@
+import chess
+
+from src.utils.game_store import find_position, get_games_engine, import_pgn
+
+PGN_WITH_VARIATIONS = """[Event "Variations"]
+[White "A"]
+[Black "B"]
+[Result "1-0"]
+
+1. e4 e5 (1... c5 2. Nf3 (2. Nc3 Nc6) d6) 2. Nf3 Nc6 3. Bb5 1-0
+
+[Event "Plain"]
+[White "C"]
+[Black "D"]
+[Result "0-1"]
+
+1. e4 c5 2. Nf3 d6 0-1
+"""
+
+
+def board_after(*sans: str) -> chess.Board:
+    board = chess.Board()
+    for san in sans:
+        board.push_san(san)
+    return board
+
+
+def test_import_pgn_with_variations(tmp_path):
+    path = tmp_path / "games.pgn"
+    path.write_text(PGN_WITH_VARIATIONS, encoding="utf-8")
+    engine = get_games_engine(str(tmp_path / "games.db"))
+
+    assert import_pgn(engine, str(path)) == 2
+
+    ruy_lopez = find_position(engine, board_after("e4", "e5", "Nf3", "Nc6", "Bb5"))
+    assert (ruy_lopez.total, ruy_lopez.white_wins) == (1, 1)
+    assert [(game.event, ply) for game, ply in ruy_lopez.games] == [("Variations", 5)]
+    assert ruy_lopez.games[0][0].moves == "e2e4 e7e5 g1f3 b8c6 f1b5"
+
+    # Only reached in a side line of the first game, so it must come from the second one alone.
+    sicilian = find_position(engine, board_after("e4", "c5", "Nf3", "d6"))
+    assert (sicilian.total, sicilian.black_wins) == (1, 1)
+    assert [game.event for game, _ in sicilian.games] == ["Plain"]
+
+    assert find_position(engine, board_after("e4", "c5", "Nc3", "Nc6")).total == 0
+    assert find_position(engine, chess.Board()).total == 2
+    engine.dispose()
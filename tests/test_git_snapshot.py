@@ -0,0 +1,61 @@
+import os
+import subprocess
+
+import pytest
+
+from src.utils.git_snapshot import REF_PREFIX, SNAPSHOT_IDENTITY, GitSnapshot, Snapshot
+
+
+def git(repo, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=repo, env=dict(os.environ, **SNAPSHOT_IDENTITY), capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    git(tmp_path, "init", "-q")
+    (tmp_path / "main.py").write_text("print('v1')\n")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("pass\n")
+    git(tmp_path, "add", "-A")
+    git(tmp_path, "commit", "-q", "-m", "initial")
+    return tmp_path
+
+
+def write_runtime_files(repo):
+    for name in ("execution_data.db", "execution_data.db-wal", "games.db", "ui_bench.json", "book.bin",
+                 "trace.json", "src/games.pgn.idx"):
+        (repo / name).write_bytes(b"data")
+
+
+def test_clean_tree_is_head(repo):
+    write_runtime_files(repo)
+    head = git(repo, "rev-parse", "HEAD")
+    snapshot = GitSnapshot("s1", cwd=str(repo / "src"), exclude=[str(repo / "trace.json")]).take()
+    assert snapshot == Snapshot(head, head)
+    assert git(repo, "for-each-ref", REF_PREFIX) == ""
+
+
+def test_dirty_tree_is_committed_on_top_of_head(repo):
+    write_runtime_files(repo)
+    (repo / "main.py").write_text("print('v2')\n")
+    (repo / "src" / "new.py").write_text("pass\n")
+    head = git(repo, "rev-parse", "HEAD")
+    status = git(repo, "status", "--porcelain")
+
+    snapshot = GitSnapshot("s1", cwd=str(repo), exclude=[str(repo / "trace.json")]).take()
+    assert snapshot.head == head
+    assert snapshot.commit != head
+    assert git(repo, "rev-parse", f"{snapshot.commit}^") == head
+    assert git(repo, "rev-parse", REF_PREFIX + "s1") == snapshot.commit
+    assert git(repo, "show", f"{snapshot.commit}:main.py") == "print('v2')"
+    assert git(repo, "ls-tree", "-r", "--name-only", snapshot.commit).split() == ["main.py", "src/app.py", "src/new.py"]
+
+    # The working tree, the index and the branch are left as they were.
+    assert git(repo, "status", "--porcelain") == status
+    assert git(repo, "rev-parse", "HEAD") == head
+
+
+def test_outside_a_repository(tmp_path):
+    assert GitSnapshot("s1", cwd=str(tmp_path)).take() is None
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from src.utils.histogram import BUCKETS, MAX_VALUE, SUB_BUCKETS, LatencyHistogram, bucket_of, bucket_range
+from src.utils.recorder import TimingRecorder
+
+
+def test_bucket_ranges_cover_values_in_order():
+    previous_high = -1
+    for bucket in range(BUCKETS):
+        low, high = bucket_range(bucket)
+        assert low == previous_high + 1
+        assert bucket_of(low) == bucket_of(high) == bucket
+        if low >= SUB_BUCKETS:
+            assert (high - low + 1) / low <= 1 / SUB_BUCKETS
+        previous_high = high
+    assert bucket_of(MAX_VALUE * 4) == BUCKETS - 1
+    assert bucket_of(-5) == 0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_percentiles_against_numpy(seed):
+    rng = np.random.default_rng(seed)
+    values = rng.lognormal(mean=12, sigma=2, size=1000).astype(np.int64)
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(int(value))
+
+    assert histogram.total == len(values)
+    for percent in (50, 95, 99, 100):
+        # 1000 samples: percent * 10 is an exact rank, where nearest-rank is numpy's "inverted_cdf".
+        expected = int(np.percentile(values, percent, method="inverted_cdf"))
+        assert histogram.percentile(percent) == bucket_range(bucket_of(expected))[1]
+    assert histogram.max == bucket_range(bucket_of(int(values.max())))[1]
+    assert LatencyHistogram().percentile(50) == 0
+
+
+def test_merge_and_bytes_round_trip():
+    first, second = LatencyHistogram(), LatencyHistogram()
+    for value in (10, 1_000, 50_000):
+        first.record(value)
+    for value in (10, 7_000_000):
+        second.record(value)
+    first.merge(second)
+    assert first.total == 5
+    assert first.counts[bucket_of(10)] == 2
+
+    restored = LatencyHistogram.from_bytes(first.to_bytes())
+    assert list(restored.counts) == list(first.counts)
+    assert restored.percentile(99) == first.percentile(99)
+
+
+def test_vectorized_buckets_match_record():
+    rng = np.random.default_rng(7)
+    durations = np.concatenate((
+        np.arange(0, 40),
+        rng.integers(0, 1 << 20, size=2000),
+        rng.lognormal(mean=15, sigma=4, size=2000).astype(np.int64),
+        [MAX_VALUE - 1, MAX_VALUE, MAX_VALUE * 8],
+    ))
+    recorder = TimingRecorder(1 << 13)
+    fast, slow = recorder.intern("fast"), recorder.intern("slow")
+    expected = {"fast": LatencyHistogram(), "slow": LatencyHistogram()}
+    for index, duration in enumerate(durations):
+        name, func_id = ("fast", fast) if index % 3 else ("slow", slow)
+        recorder.record(func_id, 0, int(duration))
+        expected[name].record(int(duration))
+        if index == 1000:
+            recorder.update_histograms()  # Folding in two steps must give the same counts.
+    recorder.update_histograms()
+
+    histograms = recorder.histograms()
+    for name, histogram in expected.items():
+        assert list(histograms[name].counts) == list(histogram.counts)
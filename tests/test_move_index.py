@@ -0,0 +1,49 @@
+import random
+
+import chess
+
+from src.utils.move_index import MoveIndex
+
+
+def test_index_matches_legal_moves_over_random_games():
+    rng = random.Random(5)
+    for _ in range(10):
+        board = chess.Board()
+        index = MoveIndex(board)
+        for _ in range(120):
+            legal = list(board.legal_moves)
+            if not legal:
+                break
+            for from_square in chess.SQUARES:
+                expected = {}
+                for move in legal:
+                    if move.from_square == from_square:
+                        expected.setdefault(move.to_square, []).append(move)
+                assert index.targets(from_square) == expected
+            move = rng.choice(legal)
+            assert move in index.find(move.from_square, move.to_square)
+            board.push(move)
+
+
+def test_promotions_are_grouped_and_missing_moves_are_empty():
+    board = chess.Board("8/P7/8/8/8/8/8/k6K w - - 0 1")
+    index = MoveIndex(board)
+    promotions = index.find(chess.A7, chess.A8)
+    assert {move.promotion for move in promotions} == {chess.QUEEN, chess.ROOK, chess.BISHOP, chess.KNIGHT}
+    assert index.find(chess.A7, chess.B8) == []
+    assert index.targets(chess.E4) == {}
+
+
+def test_index_follows_the_position_and_invalidate():
+    board = chess.Board()
+    index = MoveIndex(board)
+    assert chess.E4 in index.targets(chess.E2)
+    board.push_uci("e2e4")
+    assert index.targets(chess.E2) == {}
+    assert chess.E5 in index.targets(chess.E7)
+
+    board.set_fen(chess.STARTING_FEN)
+    assert chess.E4 in index.targets(chess.E2)
+    index.invalidate()
+    assert index._index == {}
+    assert chess.E4 in index.targets(chess.E2)
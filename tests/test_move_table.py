@@ -0,0 +1,78 @@
+import asyncio
+
+from textual.app import App
+
+from src.components.move_table import MoveTable
+
+
+class MoveTableApp(App):
+    def __init__(self):
+        super().__init__()
+        self.moves = []
+        self.table = MoveTable(self.moves)
+
+    def compose(self):
+        yield self.table
+
+
+def rows(table: MoveTable):
+    return [table.get_row_at(row) for row in range(table.row_count)]
+
+
+def run(test):
+    async def main():
+        app = MoveTableApp()
+        async with app.run_test():
+            test(app.table, app.moves)
+
+    asyncio.run(main())
+
+
+def test_sync_appends_plies():
+    def test(table, moves):
+        moves.extend(["e4", "e5", "Nf3"])
+        table.sync()
+        assert rows(table) == [["1", "e4", "e5"], ["2", "Nf3", ""]]
+        moves.append("Nc6")
+        table.sync()
+        assert rows(table) == [["1", "e4", "e5"], ["2", "Nf3", "Nc6"]]
+
+    run(test)
+
+
+def test_sync_truncates_shorter_line():
+    def test(table, moves):
+        moves.extend(["e4", "e5", "Nf3", "Nc6"])
+        table.sync()
+        del moves[1:]
+        table.sync()
+        assert rows(table) == [["1", "e4", ""]]
+
+    run(test)
+
+
+def test_clear_before_replacing_the_game():
+    def test(table, moves):
+        moves.extend(["e4", "e5"])
+        table.sync()
+        moves[:] = ["d4", "d5", "c4"]
+        table.clear()
+        table.sync()
+        assert rows(table) == [["1", "d4", "d5"], ["2", "c4", ""]]
+
+    run(test)
+
+
+def test_sync_rerenders_a_branch():
+    def test(table, moves):
+        moves.extend(["e4", "e5", "Nf3", "Nc6"])
+        table.sync()
+        # Same length, different moves after ply 1.
+        moves[1:] = ["c5", "Nf3", "d6"]
+        table.sync(changed_from=1)
+        assert rows(table) == [["1", "e4", "c5"], ["2", "Nf3", "d6"]]
+        moves[2:] = ["c3", "d5", "exd5"]
+        table.sync(changed_from=2)
+        assert rows(table) == [["1", "e4", "c5"], ["2", "c3", "d5"], ["3", "exd5", ""]]
+
+    run(test)
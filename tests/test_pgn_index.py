@@ -0,0 +1,74 @@
+import os
+
+from src.utils.pgn_index import PgnIndex
+
+# Starts with a byte order mark, which must not hide the first game.
+PGN = "\ufeff" + """[Event "First"]
+[White "A"]
+[Black "B"]
+[Result "1-0"]
+
+1. e4 e5 {a comment
+[not a tag] still the comment} 2. Nf3 1-0
+
+[Event "Second"]
+[White "C"]
+[Black "D"]
+[Result "0-1"]
+
+1. d4 d5 0-1
+[Event "Third"]
+[Result "*"]
+
+1. c4 *
+"""
+
+
+def test_index_offsets_and_reuse(tmp_path):
+    path = tmp_path / "games.pgn"
+    path.write_bytes(PGN.encode("utf-8"))
+
+    index = PgnIndex.open(str(path))
+    assert len(index) == 3
+    assert [index.read_headers(number)["Event"] for number in range(3)] == ["First", "Second", "Third"]
+    assert [move.uci() for move in index.read_game(0).mainline_moves()] == ["e2e4", "e7e5", "g1f3"]
+    assert index.read_game(2).headers["Result"] == "*"
+    index.close()
+
+    # An unchanged file reuses the saved index instead of rescanning.
+    built_at = os.stat(index.index_path).st_mtime_ns
+    reopened = PgnIndex.open(str(path))
+    assert len(reopened) == 3
+    assert os.stat(reopened.index_path).st_mtime_ns == built_at
+    reopened.close()
+
+    # Appending a game makes the index stale, so it is rebuilt.
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('\n[Event "Fourth"]\n[Result "*"]\n\n1. g3 *\n')
+    rebuilt = PgnIndex.open(str(path))
+    assert len(rebuilt) == 4
+    assert rebuilt.read_headers(3)["Event"] == "Fourth"
+    rebuilt.close()
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.pgn"
+    path.write_text("", encoding="utf-8")
+    index = PgnIndex.open(str(path))
+    assert len(index) == 0
+    index.close()
+
+
+def test_truncated_index_is_rebuilt(tmp_path):
+    path = tmp_path / "games.pgn"
+    path.write_bytes(PGN.encode("utf-8"))
+    PgnIndex.open(str(path)).close()
+
+    index_path = str(path) + ".idx"
+    with open(index_path, "r+b") as f:
+        f.truncate(os.path.getsize(index_path) - 4)
+
+    index = PgnIndex.open(str(path))
+    assert len(index) == 3
+    assert index.read_headers(2)["Event"] == "Third"
+    index.close()
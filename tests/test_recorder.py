@@ -0,0 +1,40 @@
+from src.utils.recorder import TimingRecorder
+
+
+def test_capacity_rounds_up_to_a_power_of_two():
+    assert TimingRecorder(1000).capacity == 1024
+    assert TimingRecorder(1024).capacity == 1024
+
+
+def test_intern_assigns_stable_ids():
+    recorder = TimingRecorder(8)
+    assert recorder.intern("a") == 0
+    assert recorder.intern("b") == 1
+    assert recorder.intern("a") == 0
+    assert recorder.names == ["a", "b"]
+    assert list(recorder.countdowns) == [0, 0]
+
+
+def test_record_and_events():
+    recorder = TimingRecorder(8)
+    a, b = recorder.intern("a"), recorder.intern("b")
+    recorder.record(a, 100, 350, child_ns=200, track=1)
+    recorder.record(b, 400, 450)
+
+    assert len(recorder) == 2
+    assert list(recorder.events()) == [("a", 100, 250), ("b", 400, 50)]
+    assert list(recorder.events_between(0, 2)) == [(0, "a", 100, 250, 50, 1), (1, "b", 400, 50, 50, 0)]
+
+
+def test_ring_buffer_overwrites_the_oldest_calls():
+    recorder = TimingRecorder(4)
+    func_id = recorder.intern("f")
+    for call in range(10):
+        recorder.record(func_id, call * 10, call * 10 + call)
+
+    assert recorder.total == 10
+    assert len(recorder) == 4
+    assert recorder.dropped == 6
+    assert recorder.oldest == 6
+    assert [duration for _, _, duration in recorder.events()] == [6, 7, 8, 9]
+    assert [index for index, *_ in recorder.events_between(8, 10)] == [8, 9]
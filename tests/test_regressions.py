@@ -0,0 +1,91 @@
+import math
+import random
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.utils.db_operations import save_execution_session, save_git_commit
+from src.utils.histogram import LatencyHistogram, bucket_of
+from src.utils.models import get_sync_engine, init_sync_db
+from src.utils.regressions import MIN_SAMPLES, compare, is_regression, mann_whitney, select_sessions
+
+
+def histogram(values) -> LatencyHistogram:
+    result = LatencyHistogram()
+    for value in values:
+        result.record(value)
+    return result
+
+
+def test_mann_whitney_hand_computed():
+    # Values below 16 ns have a bucket each, so these are the exact samples.
+    # U = 6 (every head call is slower), mean 3, variance 3 * 2 * (3 + 2 + 1) / 12 = 3.
+    slower, p_value = mann_whitney(histogram([1, 2, 3]), histogram([4, 5]))
+    assert slower == 1.0
+    assert p_value == pytest.approx(0.5 * math.erfc((6 - 3 - 0.5) / math.sqrt(3) / math.sqrt(2)))
+    assert p_value == pytest.approx(0.0745, abs=1e-4)  # scipy.stats.mannwhitneyu(..., alternative="greater")
+
+    # With ties: base [1, 2, 2], head [2, 3]. Head 2 beats 1 and ties both 2s (1 + 2 * 0.5),
+    # head 3 beats all three, so U = 2 + 3 = 5.
+    slower, p_value = mann_whitney(histogram([1, 2, 2]), histogram([2, 3]))
+    assert slower == pytest.approx(5 / 6)
+    ties = 3 ** 3 - 3  # The three 2s
+    variance = 3 * 2 / 12 * ((5 + 1) - ties / (5 * 4))
+    assert p_value == pytest.approx(0.5 * math.erfc((5 - 3 - 0.5) / math.sqrt(variance) / math.sqrt(2)))
+
+
+def test_mann_whitney_against_brute_force():
+    rng = random.Random(3)
+    base = [int(rng.expovariate(1 / 1e5)) for _ in range(300)]
+    head = [int(rng.expovariate(1 / 1.2e5)) for _ in range(200)]
+    buckets_base = [bucket_of(value) for value in base]
+    buckets_head = [bucket_of(value) for value in head]
+    u = sum((h > b) + 0.5 * (h == b) for h in buckets_head for b in buckets_base)
+
+    slower, _ = mann_whitney(histogram(base), histogram(head))
+    assert slower == pytest.approx(u / (len(base) * len(head)))
+
+
+def test_mann_whitney_degenerate_inputs():
+    assert mann_whitney(LatencyHistogram(), histogram([5])) == (0.5, 1.0)
+    same = histogram([1000] * 50)
+    assert mann_whitney(same, same) == (0.5, 1.0)
+
+
+def test_compare_flags_only_significant_slowdowns():
+    rng = random.Random(1)
+
+    def calls(median: float, count: int):
+        return [int(rng.lognormvariate(0, 0.3) * median) for _ in range(count)]
+
+    base = {"swap": histogram(calls(3e6, 500)), "steady": histogram(calls(7e4, 500)),
+            "rare": histogram(calls(1e6, MIN_SAMPLES - 1))}
+    head = {"swap": histogram(calls(4e6, 500)), "steady": histogram(calls(7e4, 500)),
+            "rare": histogram(calls(3e6, MIN_SAMPLES - 1))}
+    comparisons = {comparison.name: comparison for comparison in compare(base, head)}
+
+    assert is_regression(comparisons["swap"], threshold=0.1, alpha=0.01)
+    assert comparisons["swap"].slower > 0.7
+    assert not is_regression(comparisons["steady"], threshold=0.1, alpha=0.01)
+    assert not is_regression(comparisons["rare"], threshold=0.1, alpha=0.01)
+    assert not is_regression(comparisons["swap"], threshold=0.5, alpha=0.01)
+
+
+def test_commit_selector_includes_dirty_tree_sessions(tmp_path):
+    engine = get_sync_engine(str(tmp_path / "execution_data.db"))
+    init_sync_db(engine)
+    head, snapshot, other = "a1" * 20, "b2" * 20, "c3" * 20
+    with engine.begin() as conn:
+        for session_id, git_commit, head_commit in (
+                ("clean", head, head), ("dirty", snapshot, head), ("other", other, other), ("legacy", head, None)):
+            save_execution_session(conn, session_id)
+            save_git_commit(conn, session_id, git_commit, head_commit)
+        save_execution_session(conn, "untracked")
+
+    with Session(engine) as session:
+        assert sorted(select_sessions(session, head[:7])) == ["clean", "dirty", "legacy"]
+        # A snapshot hash names only the session it was taken for.
+        assert select_sessions(session, snapshot[:7]) == ["dirty"]
+        assert select_sessions(session, "session:untracked") == ["untracked"]
+        assert select_sessions(session, "ffff") == []
+    engine.dispose()
@@ -0,0 +1,107 @@
+import asyncio
+import json
+
+from src.utils.chrome_trace import ChromeTraceWriter
+from src.utils.debug import ExecutionTracker
+from src.utils.recorder import TimingRecorder
+
+
+def spans(recorder: TimingRecorder):
+    """Recorded calls by name, as ``(duration, self, track)``."""
+    return {name: (duration, self_duration, track)
+            for _, name, _, duration, self_duration, track in recorder.events_between(0, recorder.total)}
+
+
+def test_self_time_excludes_nested_calls():
+    recorder = TimingRecorder(64)
+
+    def inner():
+        return sum(range(1000))
+
+    def middle():
+        wrapped_inner()
+        return wrapped_inner()
+
+    def outer():
+        return wrapped_middle()
+
+    wrapped_inner = ExecutionTracker._wrap(inner, recorder)
+    wrapped_middle = ExecutionTracker._wrap(middle, recorder)
+    ExecutionTracker._wrap(outer, recorder)()
+
+    calls = list(recorder.events_between(0, recorder.total))
+    assert [name for _, name, *_ in calls] == ["inner", "inner", "middle", "outer"]
+    inner_durations = calls[0][3] + calls[1][3]
+    middle, outer = spans(recorder)["middle"], spans(recorder)["outer"]
+    assert middle[1] == middle[0] - inner_durations
+    assert outer[1] == outer[0] - middle[0]
+    assert len({track for *_, track in calls}) == 1
+
+
+def test_children_longer_than_the_call_leave_no_self_time():
+    recorder = TimingRecorder(8)
+    recorder.record(recorder.intern("gather"), 0, 100, child_ns=180)
+    assert list(recorder.events_between(0, 1))[0][4] == 0
+
+
+def test_gathered_calls_get_their_own_tracks():
+    recorder = TimingRecorder(64)
+
+    async def child(delay):
+        await asyncio.sleep(delay)
+
+    async def parent():
+        await asyncio.gather(wrapped_child(0.01), wrapped_child(0.01))
+        await wrapped_child(0)
+
+    wrapped_child = ExecutionTracker._wrap(child, recorder)
+    asyncio.run(ExecutionTracker._wrap(parent, recorder)())
+
+    calls = list(recorder.events_between(0, recorder.total))
+    parent_track = calls[-1][5]
+    gathered = {track for _, name, *_, track in calls[:2]}
+    assert len(gathered) == 2 and parent_track not in gathered
+    # Awaited directly, the child runs in the parent's task and stays on its track.
+    assert calls[2][1] == "child" and calls[2][5] == parent_track
+
+
+def test_task_tracks_are_reused():
+    recorder = TimingRecorder(64)
+
+    async def child():
+        await asyncio.sleep(0)
+
+    wrapped_child = ExecutionTracker._wrap(child, recorder)
+
+    async def main():
+        for _ in range(5):
+            await asyncio.gather(wrapped_child(), wrapped_child())
+
+    asyncio.run(main())
+    assert len({track for *_, track in recorder.events_between(0, recorder.total)}) == 2
+    assert len(recorder.track_names) == 2
+
+
+def test_chrome_trace(tmp_path):
+    recorder = TimingRecorder(16)
+
+    def inner():
+        pass
+
+    def outer():
+        wrapped_inner()
+
+    wrapped_inner = ExecutionTracker._wrap(inner, recorder)
+    ExecutionTracker._wrap(outer, recorder)()
+
+    path = tmp_path / "trace.json"
+    writer = ChromeTraceWriter(str(path))
+    writer.write(recorder.events_between(0, recorder.total), recorder.track_names)
+    writer.close()
+
+    events = json.loads(path.read_text())
+    assert [event["name"] for event in events] == ["thread_name", "inner", "outer"]
+    inner_event, outer_event = events[1], events[2]
+    assert outer_event["ts"] <= inner_event["ts"]
+    assert inner_event["ts"] + inner_event["dur"] <= outer_event["ts"] + outer_event["dur"]
+    assert inner_event["tid"] == outer_event["tid"] == 0
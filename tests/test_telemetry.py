@@ -0,0 +1,62 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.utils.models import ExecutionOrder, GitTracking, get_sync_engine
+from src.utils.recorder import TimingRecorder
+from src.utils.telemetry import TelemetryWriter
+
+
+def stored_indexes(db_path):
+    engine = get_sync_engine(db_path)
+    with Session(engine) as session:
+        indexes = list(session.execute(select(ExecutionOrder.order_index).order_by(ExecutionOrder.order_index)).scalars())
+    engine.dispose()
+    return indexes
+
+
+def test_flush_writes_each_call_once(tmp_path):
+    db_path = str(tmp_path / "execution_data.db")
+    recorder = TimingRecorder(16)
+    writer = TelemetryWriter(recorder, "s1", db_uri=db_path, batch_size=3)
+    func_id = recorder.intern("f")
+    for call in range(5):
+        recorder.record(func_id, call * 100, call * 100 + 10)
+
+    assert writer.flush() == 5
+    assert writer.flush() == 0
+    recorder.record(func_id, 1000, 1010)
+    assert writer.flush() == 1
+    writer.close()
+    assert stored_indexes(db_path) == list(range(6))
+    assert writer.lost == 0
+
+
+def test_overwritten_calls_are_counted_as_lost(tmp_path):
+    db_path = str(tmp_path / "execution_data.db")
+    recorder = TimingRecorder(4)
+    writer = TelemetryWriter(recorder, "s1", db_uri=db_path)
+    func_id = recorder.intern("f")
+    for call in range(10):
+        recorder.record(func_id, call, call + 1)
+
+    writer.close()
+    assert writer.lost == 6
+    assert writer.flushed == 10
+    assert stored_indexes(db_path) == [6, 7, 8, 9]
+
+
+def test_close_is_idempotent(tmp_path):
+    db_path = str(tmp_path / "execution_data.db")
+    recorder = TimingRecorder(16)
+    writer = TelemetryWriter(recorder, "s1", db_uri=db_path, trace_path=str(tmp_path / "trace.json"))
+    writer.start()
+    recorder.record(recorder.intern("f"), 0, 10)
+
+    writer.close(git_commit="abc123")
+    writer.close(git_commit="abc123")
+
+    engine = get_sync_engine(db_path)
+    with Session(engine) as session:
+        assert session.execute(select(func.count()).select_from(GitTracking)).scalar() == 1
+    engine.dispose()
+    assert stored_indexes(db_path) == [0]
@@ -0,0 +1,47 @@
+import random
+
+import chess
+import chess.polyglot
+import pytest
+
+from src.utils import zobrist
+
+
+def random_game(rng: random.Random, board: chess.Board, plies: int = 200):
+    """Play random legal moves, preferring castling, en passant and promotions when available."""
+    for _ in range(plies):
+        moves = list(board.legal_moves)
+        if not moves:
+            return
+        special = [m for m in moves if board.is_castling(m) or board.is_en_passant(m) or m.promotion]
+        yield rng.choice(special) if special and rng.random() < 0.5 else rng.choice(moves)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_incremental_hash_matches_polyglot(seed):
+    rng = random.Random(seed)
+    board = chess.Board()
+    key = chess.polyglot.zobrist_hash(board)
+    for move in random_game(rng, board):
+        key = zobrist.push(board, move, key)
+        assert key == chess.polyglot.zobrist_hash(board), board.fen()
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_incremental_hash_matches_polyglot_chess960(seed):
+    rng = random.Random(seed)
+    board = chess.Board.from_chess960_pos(rng.randrange(960))
+    key = chess.polyglot.zobrist_hash(board)
+    for move in random_game(rng, board):
+        key = zobrist.push(board, move, key)
+        assert key == chess.polyglot.zobrist_hash(board), board.fen()
+
+
+def test_en_passant_key_only_when_capture_is_possible():
+    board = chess.Board()
+    key = chess.polyglot.zobrist_hash(board)
+    for uci in ("e2e4", "a7a6", "e4e5", "d7d5"):
+        key = zobrist.push(board, chess.Move.from_uci(uci), key)
+        assert key == chess.polyglot.zobrist_hash(board)
+    key = zobrist.push(board, chess.Move.from_uci("e5d6"), key)
+    assert key == chess.polyglot.zobrist_hash(board)